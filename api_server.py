@@ -0,0 +1,215 @@
+# api_server.py
+#
+# asyncio HTTP service for translation, readability and sentiment, for use by
+# other services. Concurrent translation and sentiment requests are coalesced
+# into micro-batches before they reach the models; when a model queue is
+# full the server answers 503 instead of queueing without bound; readability
+# requests waiting for a CPU thread are capped the same way.
+#
+#   python api_server.py --port 8080 --max-batch-size 16 --max-wait-ms 10
+#
+#   POST /translate   {"text": "...", "src_lang": "ru", "tgt_lang": "en"}
+#   POST /readability {"text": "...", "lang": "ru"}   (lang optional, detected)
+#   POST /sentiment   {"text": "...", "lang": "en"}
+#   GET  /stats       batch sizes, rejections, p50/p99 latency per endpoint
+#   GET  /metrics     stage timings and counters in Prometheus format (METRICS_ENABLED=1)
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from models.nltk_resources import setup_nltk
+from utils import metrics
+from utils.micro_batcher import MicroBatcher, QueueFull, latency_percentiles
+
+SUPPORTED_PAIRS = {('ru', 'en'), ('en', 'ru')}
+
+def translate_batch(items, workers):
+    from utils.translator_registry import get_translation
+    from utils.translation_pipeline import translate_documents
+
+    # Group by language pair; each group is translated in one pass
+    groups = defaultdict(list)
+    for index, item in enumerate(items):
+        groups[(item['src_lang'], item['tgt_lang'])].append(index)
+    results = [None] * len(items)
+    for (src_lang, tgt_lang), indices in groups.items():
+        translation = get_translation(src_lang, tgt_lang)
+        if translation is None:
+            raise RuntimeError(f"No translation model found for '{src_lang}' to '{tgt_lang}'.")
+        translated = translate_documents([items[i]['text'] for i in indices], src_lang, tgt_lang, translation, workers)
+        for i, text in zip(indices, translated):
+            results[i] = text
+    return results
+
+def sentiment_batch(items, analyzer):
+    from utils.sentiment import analyze_sentiment_batch
+    return analyze_sentiment_batch([(item['text'], item['lang']) for item in items], analyzer)
+
+def readability(text, lang):
+    from utils.readability_indices import compute_indices
+    from utils.text_processing import detect_language
+    lang = lang or detect_language(text)
+    if lang not in ('ru', 'en', 'kk'):
+        return None, lang
+    return compute_indices(text, lang), lang
+
+async def read_json(request, *required, optional=()):
+    # The JSON object body; required fields must be non-empty strings and
+    # optional ones strings when present. Bad input is rejected here, since
+    # one bad item would fail every request batched with it.
+    try:
+        body = await request.json()
+    except Exception:
+        raise web.HTTPBadRequest(text='Request body must be JSON.')
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text='Request body must be a JSON object.')
+    missing = [field for field in required if not body.get(field)]
+    if missing:
+        raise web.HTTPBadRequest(text=f"Missing fields: {', '.join(missing)}")
+    invalid = [
+        field for field in (*required, *optional)
+        if body.get(field) is not None and not isinstance(body[field], str)
+    ]
+    if invalid:
+        raise web.HTTPBadRequest(text=f"Fields must be strings: {', '.join(invalid)}")
+    return body
+
+async def handle_translate(request):
+    body = await read_json(request, 'text', 'src_lang', 'tgt_lang')
+    if (body['src_lang'], body['tgt_lang']) not in SUPPORTED_PAIRS:
+        raise web.HTTPBadRequest(text='Unsupported language pair.')
+    item = {'text': body['text'], 'src_lang': body['src_lang'], 'tgt_lang': body['tgt_lang']}
+    translation = await request.app['translation_batcher'].submit(item)
+    return web.json_response({'translation': translation})
+
+async def handle_sentiment(request):
+    body = await read_json(request, 'text', 'lang')
+    if request.app['sentiment_batcher'] is None:
+        raise web.HTTPServiceUnavailable(text='Sentiment model is not available.')
+    if body['lang'] not in ('ru', 'en'):
+        raise web.HTTPBadRequest(text='Sentiment is supported for ru and en only.')
+    sentiment = await request.app['sentiment_batcher'].submit({'text': body['text'], 'lang': body['lang']})
+    return web.json_response({'sentiment': sentiment})
+
+async def handle_readability(request):
+    body = await read_json(request, 'text', optional=('lang',))
+    app = request.app
+    # Same backpressure as the batched endpoints: the executor's own queue is unbounded
+    if app['readability_pending'] >= app['max_queue']:
+        app['readability_rejected'] += 1
+        raise QueueFull('readability queue is full')
+    app['readability_pending'] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        indices, lang = await loop.run_in_executor(app['cpu_executor'], readability, body['text'], body.get('lang'))
+    finally:
+        app['readability_pending'] -= 1
+    if indices is None:
+        raise web.HTTPBadRequest(text='Language could not be detected or is not supported.')
+    return web.json_response({'lang': lang, 'indices': indices})
+
+async def handle_stats(request):
+    app = request.app
+    batchers = [app['translation_batcher'], app['sentiment_batcher']]
+    return web.json_response({
+        'batchers': {b.name: b.stats() for b in batchers if b is not None},
+        'readability': {'pending': app['readability_pending'], 'rejected': app['readability_rejected']},
+        'latency_seconds': {path: latency_percentiles(list(samples)) for path, samples in app['latencies'].items()},
+    })
+
+async def handle_metrics(request):
+    # Prometheus text exposition format
+    return web.Response(
+        body=metrics.render_prometheus().encode('utf-8'),
+        headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+    )
+
+async def handle_health(request):
+    return web.json_response({'status': 'ok'})
+
+@web.middleware
+async def timing_middleware(request, handler):
+    start = time.perf_counter()
+    try:
+        return await handler(request)
+    except QueueFull:
+        # Backpressure: the caller should retry later rather than pile up here
+        raise web.HTTPServiceUnavailable(text='Server is busy, retry later.', headers={'Retry-After': '1'})
+    finally:
+        # Keyed by route, so unmatched paths (404s) cannot add new sample buffers
+        resource = request.match_info.route.resource
+        if resource is not None:
+            request.app['latencies'][resource.canonical].append(time.perf_counter() - start)
+
+def create_app(max_batch_size=16, max_wait_ms=10, max_queue=256, translation_workers=None, load_sentiment=True):
+    app = web.Application(middlewares=[timing_middleware])
+    app['latencies'] = defaultdict(lambda: deque(maxlen=10_000))
+    app['cpu_executor'] = ThreadPoolExecutor(max_workers=4, thread_name_prefix='readability')
+    app['max_queue'] = max_queue
+    app['readability_pending'] = 0
+    app['readability_rejected'] = 0
+
+    async def on_startup(app):
+        setup_nltk()
+        # One executor thread per model, so batches for a model never overlap
+        app['translation_batcher'] = MicroBatcher(
+            'translation', lambda items: translate_batch(items, translation_workers),
+            max_batch_size, max_wait_ms, max_queue, ThreadPoolExecutor(max_workers=1, thread_name_prefix='argos'),
+        )
+        app['translation_batcher'].start()
+
+        app['sentiment_batcher'] = None
+        if load_sentiment:
+            from models.transformers_models import load_sentiment_analyzer
+            analyzer = await asyncio.get_running_loop().run_in_executor(None, load_sentiment_analyzer)
+            if analyzer is not None:
+                app['sentiment_batcher'] = MicroBatcher(
+                    'sentiment', lambda items: sentiment_batch(items, analyzer),
+                    max_batch_size, max_wait_ms, max_queue, ThreadPoolExecutor(max_workers=1, thread_name_prefix='finbert'),
+                )
+                app['sentiment_batcher'].start()
+
+    async def on_cleanup(app):
+        for name in ('translation_batcher', 'sentiment_batcher'):
+            if app.get(name) is not None:
+                await app[name].stop()
+                app[name].executor.shutdown(wait=False)
+        app['cpu_executor'].shutdown(wait=False)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/translate', handle_translate)
+    app.router.add_post('/readability', handle_readability)
+    app.router.add_post('/sentiment', handle_sentiment)
+    app.router.add_get('/stats', handle_stats)
+    app.router.add_get('/health', handle_health)
+    app.router.add_get('/metrics', handle_metrics)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description='Translation, readability and sentiment HTTP API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=16)
+    parser.add_argument('--max-wait-ms', type=float, default=10)
+    parser.add_argument('--max-queue', type=int, default=256, help='Queued requests per model before answering 503')
+    parser.add_argument('--translation-workers', type=int, default=None, help='Argos worker processes (default TRANSLATION_WORKERS)')
+    parser.add_argument('--no-sentiment', action='store_true', help='Do not load FinBERT')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app(
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue=args.max_queue,
+        translation_workers=args.translation_workers,
+        load_sentiment=not args.no_sentiment,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
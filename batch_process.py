@@ -0,0 +1,264 @@
+# batch_process.py
+#
+# Headless bulk processing: readability, sentiment and translation for every
+# .txt/.docx/.pdf file under the given directories or globs, one JSON line per
+# document. Re-running with the same --output resumes an interrupted run.
+# Sentiment runs on its own small pool (--sentiment-workers), since every
+# worker that runs it holds a copy of FinBERT.
+#
+#   python batch_process.py reports/ "archive/**/*.pdf" --output results.jsonl \
+#       --tasks readability,sentiment,translation --translations-dir translated/
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+SUPPORTED_EXTENSIONS = ('.txt', '.docx', '.pdf')
+ALL_TASKS = ('readability', 'sentiment', 'translation')
+
+# Per-worker state, set up once by the pool initializer
+_worker_tasks = ()
+_worker_sentiment_analyzer = None
+
+def iter_input_files(patterns):
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = (
+                os.path.join(root, name)
+                for root, _, names in os.walk(pattern)
+                for name in sorted(names)
+            )
+        else:
+            paths = sorted(glob.iglob(pattern, recursive=True))
+        for path in paths:
+            path = os.path.abspath(path)
+            if path.lower().endswith(SUPPORTED_EXTENSIONS) and path not in seen:
+                seen.add(path)
+                yield path
+
+def load_completed(output_path):
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Partial last line from an interrupted run
+                continue
+            if record.get('status') == 'ok':
+                completed.add(record['path'])
+    return completed
+
+def _init_worker(tasks, workers):
+    global _worker_tasks
+    logging.basicConfig(level=logging.WARNING)
+    from models.nltk_resources import setup_nltk
+    from utils.runtime_config import configure_translation
+    setup_nltk()
+    _worker_tasks = tasks
+    # The pool shares the cores: each worker gets its slice of threads
+    if 'translation' in tasks:
+        configure_translation(workers)
+
+def _init_sentiment_worker(workers):
+    global _worker_sentiment_analyzer
+    logging.basicConfig(level=logging.WARNING)
+    from models.nltk_resources import setup_nltk
+    from models.transformers_models import load_sentiment_analyzer
+    setup_nltk()
+    _worker_sentiment_analyzer = load_sentiment_analyzer(workers=workers)
+
+def analyze_file_sentiment(path, lang):
+    # Runs on the sentiment pool. The file is read again rather than its text
+    # being sent between processes; reading is cheap next to inference.
+    # Returns {} when there is no analyzer, else {'sentiment', 'timing'} or {'error'}.
+    if _worker_sentiment_analyzer is None:
+        return {}
+    try:
+        from utils.file_readers import extract_text
+        from utils.sentiment import analyze_sentiment
+        text = extract_text(path)
+        start = time.perf_counter()
+        sentiment = analyze_sentiment(text, _worker_sentiment_analyzer, lang)
+        result = {'timing': time.perf_counter() - start}
+        if sentiment is not None:
+            result['sentiment'] = {
+                'label': sentiment['label'],
+                'score': sentiment['score'],
+                'sections': [{k: v for k, v in s.items() if k != 'preview'} for s in sentiment['sections']],
+            }
+        return result
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+def merge_sentiment(record, result):
+    if 'error' in result:
+        record['status'] = 'error'
+        record['error'] = result['error']
+    if 'timing' in result:
+        record['timings']['sentiment'] = result['timing']
+    if 'sentiment' in result:
+        record['sentiment'] = result['sentiment']
+    return record
+
+def process_file(path, target_langs, translations_dir):
+    record = {'path': path, 'status': 'ok', 'timings': {}}
+    timings = record['timings']
+    start = time.perf_counter()
+    try:
+        from utils.file_readers import extract_text
+        from utils.text_processing import detect_language_with_confidence
+
+        # Errors must reach the except below, so the file is retried on resume;
+        # the UI wrappers (read_file, argos_translate) report them through
+        # Streamlit and return "" instead
+        text = extract_text(path)
+        timings['read'] = time.perf_counter() - start
+        record['characters'] = len(text)
+
+        stage_start = time.perf_counter()
+        lang, record['lang_confidence'] = detect_language_with_confidence(text)
+        timings['detect'] = time.perf_counter() - stage_start
+        record['lang'] = lang
+
+        if 'readability' in _worker_tasks and lang:
+            from utils.text_stats import compute_text_stats
+            from utils.readability_indices import (
+                flesch_reading_ease,
+                flesch_kincaid_grade_level,
+                gunning_fog_index,
+                smog_index,
+            )
+            stage_start = time.perf_counter()
+            stats = compute_text_stats(text, lang)
+            record['readability'] = {
+                'flesch_reading_ease': flesch_reading_ease(stats),
+                'flesch_kincaid_grade_level': flesch_kincaid_grade_level(stats),
+                'gunning_fog_index': gunning_fog_index(stats),
+                'smog_index': smog_index(stats),
+                'sentences': stats.num_sentences,
+                'words': stats.num_words,
+            }
+            timings['readability'] = time.perf_counter() - stage_start
+
+        tgt_lang = target_langs.get(lang)
+        if 'translation' in _worker_tasks and tgt_lang:
+            from utils.translator_registry import get_translation
+            from utils.translation_pipeline import translate_document
+            stage_start = time.perf_counter()
+            translation = get_translation(lang, tgt_lang)
+            if translation is None:
+                raise RuntimeError(f"No translation model found for '{lang}' to '{tgt_lang}'.")
+            # Parallelism comes from the batch pool; translate in-process
+            translated_text = translate_document(text, lang, tgt_lang, translation, workers=1)
+            timings['translation'] = time.perf_counter() - stage_start
+            if translations_dir:
+                name = os.path.splitext(os.path.basename(path))[0]
+                digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]
+                out_path = os.path.join(translations_dir, f"{name}.{digest}.{tgt_lang}.txt")
+                with open(out_path, 'w', encoding='utf-8') as f:
+                    f.write(translated_text)
+                record['translation_path'] = out_path
+            record['translation_characters'] = len(translated_text)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+
+    timings['total'] = time.perf_counter() - start
+    return record
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk readability, sentiment and translation')
+    parser.add_argument('inputs', nargs='+', help='Directories or glob patterns')
+    parser.add_argument('--output', default='results.jsonl', help='JSONL results file (appended to)')
+    parser.add_argument('--tasks', default='readability,sentiment', help=f"Comma-separated subset of {','.join(ALL_TASKS)}")
+    parser.add_argument('--translations-dir', help='Where to write translated texts')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processes for reading, readability and translation')
+    parser.add_argument(
+        '--sentiment-workers', type=int, default=1,
+        help='Processes for sentiment; each holds its own FinBERT copy (about 0.5 GB), so keep this small',
+    )
+    parser.add_argument('--max-in-flight', type=int, default=None, help='Bound on queued documents (default 2 x workers)')
+    parser.add_argument('--no-resume', action='store_true', help='Reprocess files already in the output')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    tasks = tuple(task.strip() for task in args.tasks.split(',') if task.strip())
+    unknown = set(tasks) - set(ALL_TASKS)
+    if unknown:
+        parser.error(f"Unknown tasks: {', '.join(sorted(unknown))}")
+    if args.translations_dir:
+        os.makedirs(args.translations_dir, exist_ok=True)
+
+    completed = set() if args.no_resume else load_completed(args.output)
+    if completed:
+        logging.info(f"Resuming: {len(completed)} documents already processed.")
+    target_langs = {'ru': 'en', 'en': 'ru'}
+    max_in_flight = args.max_in_flight or args.workers * 2
+
+    processed = failed = 0
+    run_start = time.perf_counter()
+    sentiment_workers = args.sentiment_workers if 'sentiment' in tasks else 0
+    with open(args.output, 'a', encoding='utf-8') as out, ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(tasks, args.workers),
+    ) as pool, ProcessPoolExecutor(
+        max_workers=max(1, sentiment_workers),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_sentiment_worker,
+        initargs=(max(1, sentiment_workers),),
+    ) as sentiment_pool:
+        pending = set()
+        # Sentiment future -> the record it completes
+        awaiting_sentiment = {}
+
+        def write(record):
+            nonlocal processed, failed
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            processed += 1
+            failed += record['status'] != 'ok'
+
+        def drain(return_when):
+            nonlocal pending
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                if future in awaiting_sentiment:
+                    write(merge_sentiment(awaiting_sentiment.pop(future), future.result()))
+                    continue
+                record = future.result()
+                if sentiment_workers and record['status'] == 'ok' and record.get('lang') in ('ru', 'en'):
+                    # The document stays in flight until its sentiment is done
+                    sentiment_future = sentiment_pool.submit(analyze_file_sentiment, record['path'], record['lang'])
+                    awaiting_sentiment[sentiment_future] = record
+                    pending.add(sentiment_future)
+                else:
+                    write(record)
+            out.flush()
+
+        # Only max_in_flight documents are queued at a time, so memory stays
+        # bounded no matter how many files match
+        for path in iter_input_files(args.inputs):
+            if path in completed:
+                continue
+            if len(pending) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+            pending.add(pool.submit(process_file, path, target_langs, args.translations_dir))
+        while pending:
+            drain(FIRST_COMPLETED)
+
+    elapsed = time.perf_counter() - run_start
+    logging.info(f"Processed {processed} documents ({failed} failed) in {elapsed:.1f}s.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_docx_translation.py
+#
+# Structure-preserving DOCX translation on a generated table-heavy document
+# (a financial table with repeated row labels, plus the same header and
+# footer in every section). Reports how many segments the document has, how
+# many unique ones reach the translator and the resulting throughput. The
+# translator is a stand-in with a fixed per-sentence cost, so the numbers
+# reflect the pipeline rather than the model; pass --argos to use the
+# installed Argos model instead.
+#
+#   python -m benchmarks.bench_docx_translation --rows 2000 --sections 20
+
+import argparse
+import io
+import os
+import tempfile
+import time
+import docx
+from benchmarks.corpus import SEED_SENTENCES
+
+ROW_LABELS = [
+    "Revenue", "Cost of sales", "Gross profit", "Operating expenses", "Net profit",
+    "Total assets", "Total liabilities", "Equity",
+]
+
+class FixedCostTranslator:
+    def __init__(self, cost):
+        self.cost = cost
+        self.calls = 0
+
+    def translate(self, sentence):
+        self.calls += 1
+        time.sleep(self.cost)
+        return sentence.upper()
+
+def build_document(rows, sections):
+    doc = docx.Document()
+    sentences = SEED_SENTENCES['en']
+    for s in range(sections):
+        section = doc.sections[0] if s == 0 else doc.add_section()
+        section.header.is_linked_to_previous = False
+        section.header.paragraphs[0].text = "Confidential. For internal use only."
+        section.footer.is_linked_to_previous = False
+        section.footer.paragraphs[0].text = "Annual report of the company"
+        doc.add_paragraph(sentences[s % len(sentences)])
+        table = doc.add_table(rows=rows // sections, cols=3)
+        for i, row in enumerate(table.rows):
+            row.cells[0].text = ROW_LABELS[i % len(ROW_LABELS)]
+            row.cells[1].text = str(1000 + i)
+            row.cells[2].text = "Increase compared to the previous year" if i % 2 else "Decrease compared to the previous year"
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description='DOCX-to-DOCX translation throughput on a table-heavy document')
+    parser.add_argument('--rows', type=int, default=2_000)
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--cost-ms', type=float, default=2.0, help='Per-sentence cost of the stand-in translator')
+    parser.add_argument('--argos', action='store_true', help='Translate en->ru with the installed Argos model')
+    args = parser.parse_args()
+
+    # A throwaway translation memory, so every run starts cold
+    memory_dir = tempfile.mkdtemp()
+    os.environ['TRANSLATION_MEMORY_PATH'] = os.path.join(memory_dir, 'tm.sqlite3')
+    from utils.docx_translation import translate_docx
+
+    if args.argos:
+        from utils.translator_registry import get_translation
+        translation = get_translation('en', 'ru')
+        if translation is None:
+            raise SystemExit("No en->ru Argos model installed; run install_language_packages.py.")
+    else:
+        translation = FixedCostTranslator(args.cost_ms / 1000)
+
+    data = build_document(args.rows, args.sections)
+    start = time.perf_counter()
+    output, counts = translate_docx(data, 'en', 'ru', translation, workers=1)
+    elapsed = time.perf_counter() - start
+
+    print(f"document: {len(data) / 1024:.0f} KiB, {counts['segments']} segments, {counts['unique_segments']} unique")
+    if not args.argos:
+        print(f"translator calls: {translation.calls}")
+    print(f"time: {elapsed:.2f} s, {counts['segments'] / elapsed:,.0f} segments/s, output {len(output) / 1024:.0f} KiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_language_detection.py
+#
+# Document language detection: expected verdicts on cases that have gone
+# wrong before (Russian text quoting Kazakh names, Ukrainian without its
+# unique letters), plus timing of document and per-paragraph detection on
+# generated ru/en/kk documents. Exits non-zero on a wrong verdict, so it
+# doubles as the regression check.
+#
+#   python -m benchmarks.bench_language_detection --sizes 100KB,1MB
+
+import argparse
+import time
+from benchmarks.corpus import SEED_SENTENCES, generate_sized_corpus, parse_size
+from utils.text_processing import detect_language_with_confidence, detect_paragraph_languages
+
+# (text, expected language or None for "not supported")
+CASES = [
+    ("Акционерное общество «Қазақтелеком» сообщает, что выручка за отчётный период выросла на двенадцать процентов.", 'ru'),
+    ("Филиалы компании работают в городах Өскемен, Қарағанды и Шымкент, а головной офис находится в Астане.", 'ru'),
+    ("Привіт, як справи? Все добре, дякую.", None),
+    ("Компанія продовжує реалізацію стратегії сталого розвитку, а прибуток зріс на десять відсотків.", None),
+    (' '.join(SEED_SENTENCES['ru']), 'ru'),
+    (' '.join(SEED_SENTENCES['en']), 'en'),
+    (' '.join(SEED_SENTENCES['kk']), 'kk'),
+    # Sample windows that fall entirely on whitespace (e.g. runs of empty paragraphs)
+    ("a" * 2000 + "\n" * 1500 + "b" * 2000, None),
+    (' '.join(SEED_SENTENCES['en']) + "\n" * 5000 + ' '.join(SEED_SENTENCES['en']), 'en'),
+] + [(sentence, 'kk') for sentence in SEED_SENTENCES['kk']]
+
+def check_cases():
+    failures = 0
+    for text, expected in CASES:
+        lang, confidence = detect_language_with_confidence(text)
+        if lang != expected:
+            failures += 1
+            print(f"  FAIL expected {expected}, got {lang} ({confidence:.2f}): {text[:70]}")
+    print(f"{len(CASES) - failures}/{len(CASES)} detection cases correct")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Language detection correctness and timing')
+    parser.add_argument('--sizes', default='100KB,1MB')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = check_cases()
+    for size in args.sizes.split(','):
+        for lang in SEED_SENTENCES:
+            text = generate_sized_corpus(lang, parse_size(size))
+            detect_language_with_confidence(text)
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                detected, _ = detect_language_with_confidence(text)
+            document_time = (time.perf_counter() - start) / args.repeats
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                paragraphs = detect_paragraph_languages(text)
+            paragraph_time = (time.perf_counter() - start) / args.repeats
+            print(f"  {size:>6} {lang}: detected {detected}, document {document_time * 1000:8.2f} ms, "
+                  f"{len(paragraphs)} paragraphs {paragraph_time * 1000:8.2f} ms")
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_runtime_matrix.py
+#
+# Translation and sentiment throughput across runtime settings
+# (utils/runtime_config.py): threads per worker, CTranslate2 compute type and
+# beam size for Argos, threads and int8 quantization for FinBERT. Argos reads
+# its settings at import and torch fixes its thread pools on first use, so
+# every cell of the matrix runs in a fresh interpreter. Needs an installed
+# en->ru Argos package and the local FinBERT model; cells that cannot run
+# (e.g. float16 on CPU) are reported as failed.
+#
+#   python -m benchmarks.bench_runtime_matrix --threads 1,2,4 --compute-types int8,float32 --beams 1,4
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_translation(words):
+    from benchmarks.corpus import generate_corpus
+    from models.nltk_resources import setup_nltk
+    from utils.runtime_config import configure_translation
+    from utils.tokenizers import sent_tokenize
+    from utils.translator_registry import get_translation
+
+    setup_nltk()
+    config = configure_translation()
+    translation = get_translation('en', 'ru')
+    if translation is None:
+        raise SystemExit("No en->ru Argos model installed; run install_language_packages.py.")
+    sentences = sent_tokenize(generate_corpus('en', words), 'en')
+    translation.translate(sentences[0])
+    start = time.perf_counter()
+    for sentence in sentences:
+        translation.translate(sentence)
+    elapsed = time.perf_counter() - start
+    return config, {'sentences_per_s': len(sentences) / elapsed}
+
+def run_sentiment(words, quantize):
+    from benchmarks.corpus import generate_corpus
+    from models.nltk_resources import setup_nltk
+    from models.transformers_models import load_sentiment_analyzer
+    from utils.runtime_config import configure_torch
+    from utils.sentiment import chunk_text, classify_chunks
+
+    setup_nltk()
+    config = configure_torch()
+    analyzer = load_sentiment_analyzer(quantize=quantize)
+    if analyzer is None:
+        raise SystemExit("Sentiment analyzer could not be loaded.")
+    chunks = chunk_text(generate_corpus('en', words), analyzer.tokenizer, 'en')
+    start = time.perf_counter()
+    classify_chunks(chunks, analyzer)
+    elapsed = time.perf_counter() - start
+    return config, {'chunks_per_s': len(chunks) / elapsed}
+
+def run_cell(env, args):
+    # One matrix cell in a fresh interpreter; returns the parsed result or None
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_runtime_matrix', '--cell', *args],
+        cwd=REPO_ROOT, env={**os.environ, **env}, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Translation and sentiment throughput across runtime settings')
+    parser.add_argument('--device', default='cpu', help='INFERENCE_DEVICE for every cell: auto, cpu or cuda')
+    parser.add_argument('--threads', default=','.join(str(n) for n in sorted({1, 2, os.cpu_count() or 1})))
+    parser.add_argument('--compute-types', default='int8,float32')
+    parser.add_argument('--beams', default='1,2,4')
+    parser.add_argument('--words', type=int, default=2_000)
+    parser.add_argument('--skip-translation', action='store_true')
+    parser.add_argument('--skip-sentiment', action='store_true')
+    parser.add_argument('--cell', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cell:
+        kind, *options = args.cell
+        if kind == 'translation':
+            config, result = run_translation(args.words)
+        else:
+            config, result = run_sentiment(args.words, quantize=options[0] == 'int8')
+        print(json.dumps({**config, **result}))
+        return
+
+    threads = [int(n) for n in args.threads.split(',')]
+    words = ['--words', str(args.words)]
+    if not args.skip_translation:
+        print(f"translation en->ru, {args.words} words, device {args.device}")
+        print(f"  {'threads':>7} {'compute type':>14} {'beam':>5} {'sentences/s':>12}")
+        for n, compute_type, beam in itertools.product(threads, args.compute_types.split(','), args.beams.split(',')):
+            env = {
+                'INFERENCE_DEVICE': args.device, 'INFERENCE_THREADS': str(n),
+                'TRANSLATION_COMPUTE_TYPE': compute_type, 'TRANSLATION_BEAM_SIZE': beam,
+            }
+            result = run_cell(env, ['translation', *words])
+            rate = 'failed' if result is None else f"{result['sentences_per_s']:.1f}"
+            print(f"  {n:>7} {compute_type:>14} {beam:>5} {rate:>12}")
+
+    if not args.skip_sentiment:
+        print(f"\nsentiment (FinBERT), {args.words} words, device {args.device}")
+        print(f"  {'threads':>7} {'weights':>8} {'chunks/s':>10}")
+        for n, weights in itertools.product(threads, ('fp32', 'int8')):
+            env = {'INFERENCE_DEVICE': args.device, 'INFERENCE_THREADS': str(n)}
+            result = run_cell(env, ['sentiment', weights, *words])
+            rate = 'failed' if result is None else f"{result['chunks_per_s']:.1f}"
+            print(f"  {n:>7} {weights:>8} {rate:>10}")
+
+if __name__ == '__main__':
+    main()
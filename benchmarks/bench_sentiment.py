@@ -0,0 +1,46 @@
+# benchmarks/bench_sentiment.py
+#
+# Chunked FinBERT throughput on CPU for a range of batch sizes. Needs the
+# local model from download_finbert.py.
+#
+#   python -m benchmarks.bench_sentiment --words 20000 --batch-sizes 1,4,8,16,32
+
+import argparse
+import time
+from benchmarks.corpus import generate_corpus
+from models.nltk_resources import setup_nltk
+from models.transformers_models import load_sentiment_analyzer
+from utils.sentiment import chunk_text, classify_chunks
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunked sentiment throughput benchmark')
+    parser.add_argument('--words', type=int, default=20_000)
+    parser.add_argument('--lang', default='en')
+    parser.add_argument('--batch-sizes', default='1,4,8,16,32')
+    args = parser.parse_args()
+
+    setup_nltk()
+    analyzer = load_sentiment_analyzer()
+    if analyzer is None:
+        raise SystemExit("Sentiment analyzer could not be loaded.")
+    text = generate_corpus(args.lang, args.words)
+
+    start = time.perf_counter()
+    chunks = chunk_text(text, analyzer.tokenizer, args.lang)
+    chunking_time = time.perf_counter() - start
+    tokens = sum(count for _, count in chunks)
+    print(f"{len(chunks)} chunks, {tokens} tokens, chunking {chunking_time:.2f}s")
+
+    # Warm up once so the first batch size does not pay for lazy initialization
+    classify_chunks(chunks[:2], analyzer, batch_size=2)
+    for batch_size in (int(size) for size in args.batch_sizes.split(',')):
+        start = time.perf_counter()
+        classify_chunks(chunks, analyzer, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(
+            f"batch_size={batch_size:3d}: {elapsed:7.2f}s | {len(chunks) / elapsed:7.2f} chunks/s | "
+            f"{tokens / elapsed:9.0f} tokens/s"
+        )
+
+if __name__ == '__main__':
+    main()
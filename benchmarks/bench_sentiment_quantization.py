@@ -0,0 +1,67 @@
+# benchmarks/bench_sentiment_quantization.py
+#
+# Full-precision vs int8 dynamically quantized FinBERT on CPU: latency per
+# chunk and label/score drift on the same chunks. Exits non-zero when the
+# drift exceeds the given bounds, so it doubles as the parity check for the
+# quantized backend. Needs the local model from download_finbert.py.
+#
+#   python -m benchmarks.bench_sentiment_quantization --words 5000
+
+import argparse
+import sys
+import time
+from benchmarks.corpus import generate_corpus
+from models.nltk_resources import setup_nltk
+from models.transformers_models import load_sentiment_analyzer
+from utils.sentiment import chunk_text, classify_chunks
+
+def timed_classify(chunks, analyzer, batch_size, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scores = classify_chunks(chunks, analyzer, batch_size)
+        best = min(best, time.perf_counter() - start)
+    return scores, best
+
+def main():
+    parser = argparse.ArgumentParser(description='FinBERT fp32 vs int8 CPU parity and latency')
+    parser.add_argument('--words', type=int, default=5_000)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--max-label-disagreement', type=float, default=0.05, help='Fraction of chunks')
+    parser.add_argument('--max-score-drift', type=float, default=0.10, help='Max abs probability difference')
+    args = parser.parse_args()
+
+    setup_nltk()
+    reference = load_sentiment_analyzer(device=-1, quantize=False)
+    quantized = load_sentiment_analyzer(device=-1, quantize=True)
+    if reference is None or quantized is None:
+        raise SystemExit("Sentiment analyzer could not be loaded.")
+
+    chunks = []
+    for lang in ('en', 'ru'):
+        chunks.extend(chunk_text(generate_corpus(lang, args.words // 2), reference.tokenizer, lang))
+
+    reference_scores, reference_time = timed_classify(chunks, reference, args.batch_size, args.repeats)
+    quantized_scores, quantized_time = timed_classify(chunks, quantized, args.batch_size, args.repeats)
+
+    disagreements = 0
+    max_drift = 0.0
+    for ref, quant in zip(reference_scores, quantized_scores):
+        disagreements += max(ref, key=ref.get) != max(quant, key=quant.get)
+        max_drift = max(max_drift, max(abs(ref[label] - quant[label]) for label in ref))
+    disagreement_rate = disagreements / len(chunks)
+
+    print(f"{len(chunks)} chunks, batch size {args.batch_size}")
+    print(f"fp32: {reference_time * 1000 / len(chunks):8.2f} ms/chunk")
+    print(f"int8: {quantized_time * 1000 / len(chunks):8.2f} ms/chunk  (x{reference_time / quantized_time:.2f})")
+    print(f"label disagreement {disagreement_rate:.2%} (bound {args.max_label_disagreement:.2%}), "
+          f"max score drift {max_drift:.4f} (bound {args.max_score_drift:.4f})")
+
+    if disagreement_rate > args.max_label_disagreement or max_drift > args.max_score_drift:
+        print("PARITY FAILED")
+        sys.exit(1)
+    print("parity ok")
+
+if __name__ == '__main__':
+    main()
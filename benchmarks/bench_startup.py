@@ -0,0 +1,91 @@
+# benchmarks/bench_startup.py
+#
+# Cold-start cost of the Streamlit app, every number measured in a fresh
+# interpreter: import time of the heavy libraries the app may pull in, import
+# time of main.py, and time to first render for each mode. Rendering uses
+# streamlit.testing's AppTest, which runs the script without a browser; the
+# modules each mode ends up importing are listed to catch eager imports.
+#
+#   python -m benchmarks.bench_startup --repeats 5
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    'streamlit', 'numpy', 'nltk', 'langdetect', 'pyphen', 'docx', 'PyPDF2',
+    'torch', 'transformers', 'argostranslate',
+]
+MODES = ["Анализ удобочитаемости", "Перевод"]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+RENDER_SNIPPET = """
+import sys
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file('main.py', default_timeout=300)
+app.session_state['functionality'] = {mode!r}
+app.run()
+elapsed = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(str(app.exception))
+print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_snippet(code):
+    # Returns the snippet's stdout, or None when it failed (e.g. module not installed)
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip().splitlines()[-1]
+
+def measure(code, repeats):
+    # Median seconds over fresh interpreters, plus the last run's extra output
+    times = []
+    extra = ''
+    for _ in range(repeats):
+        output = run_snippet(code)
+        if output is None:
+            return None, ''
+        elapsed, _, extra = output.partition(' ')
+        times.append(float(elapsed))
+    return statistics.median(times), extra
+
+def main():
+    parser = argparse.ArgumentParser(description='Streamlit app import time and time to first render')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--skip-libraries', action='store_true', help='Only measure main.py and the modes')
+    args = parser.parse_args()
+
+    if not args.skip_libraries:
+        print("import time, fresh interpreter (median)")
+        for module in HEAVY_MODULES:
+            seconds, _ = measure(IMPORT_SNIPPET.format(module=module), args.repeats)
+            print(f"  {module:16} {'not installed' if seconds is None else f'{seconds * 1000:8.0f} ms'}")
+
+    seconds, _ = measure(IMPORT_SNIPPET.format(module='main'), args.repeats)
+    print(f"\nimport main.py     {'failed' if seconds is None else f'{seconds * 1000:8.0f} ms'}")
+
+    print("\ntime to first render (median, includes importing streamlit)")
+    for mode in MODES:
+        seconds, modules = measure(RENDER_SNIPPET.format(mode=mode, heavy=HEAVY_MODULES), args.repeats)
+        if seconds is None:
+            print(f"  {mode:24} failed (is streamlit installed?)")
+        else:
+            print(f"  {mode:24} {seconds * 1000:8.0f} ms   loaded: {modules or '-'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_syllables.py
+#
+# Syllable counting throughput before (new pyphen.Pyphen per word, as
+# count_syllables used to do) and after (cached dictionary + LRU memo + batch API).
+# Words are Zipf-sampled from a large vocabulary rather than repeated seed
+# sentences, so the memo hit rate, reported next to the speedup, is close to
+# what real documents see.
+#
+#   python -m benchmarks.bench_syllables --words 200000 --vocabulary 50000
+
+import argparse
+import time
+import pyphen
+from benchmarks.corpus import zipf_words
+from utils.text_processing import count_syllables_batch, syllable_cache_info, _count_syllables_cached
+
+def count_syllables_uncached(word, lang):
+    dic = pyphen.Pyphen(lang=lang)
+    hyphens = dic.inserted(word)
+    return max(1, hyphens.count('-') + 1)
+
+def words_per_second(func, words):
+    start = time.perf_counter()
+    func(words)
+    elapsed = time.perf_counter() - start
+    return len(words) / elapsed if elapsed else float('inf'), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Syllable counting throughput benchmark')
+    parser.add_argument('--words', type=int, default=200_000, help='Corpus size per language')
+    parser.add_argument('--vocabulary', type=int, default=50_000, help='Distinct words to sample from')
+    args = parser.parse_args()
+
+    for lang in ('ru', 'en'):
+        words = zipf_words(lang, args.words, args.vocabulary)
+        before, before_time = words_per_second(
+            lambda ws: [count_syllables_uncached(w, lang) for w in ws], words
+        )
+        _count_syllables_cached.cache_clear()
+        after, after_time = words_per_second(lambda ws: count_syllables_batch(ws, lang), words)
+        info = syllable_cache_info()
+        hit_rate = info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0
+        print(
+            f"{lang}: {len(words)} words, {len(set(words))} distinct | before {before:,.0f} words/s ({before_time:.2f}s) | "
+            f"after {after:,.0f} words/s ({after_time:.2f}s) | speedup x{after / before:.1f} | "
+            f"memo hit rate {hit_rate:.1%} ({info.hits} hits, {info.misses} misses)"
+        )
+
+if __name__ == '__main__':
+    main()
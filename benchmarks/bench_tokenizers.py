@@ -0,0 +1,75 @@
+# benchmarks/bench_tokenizers.py
+#
+# Regex vs NLTK tokenizer: sentence splits against the hand-split corpus in
+# benchmarks/tokenizer_corpus.py, word-count agreement with NLTK on the same
+# text, and throughput on a generated corpus. Exits non-zero when the regex
+# backend misses gold splits or drifts from NLTK beyond the given bounds, so
+# it doubles as the parity check for the regex backend. The NLTK columns are
+# skipped when punkt is not available.
+#
+#   python -m benchmarks.bench_tokenizers --words 200000
+
+import argparse
+import sys
+import time
+from benchmarks.corpus import generate_corpus
+from benchmarks.tokenizer_corpus import TOKENIZER_CORPUS, corpus_text
+from models.nltk_resources import setup_nltk
+from utils.tokenizers import get_tokenizer, punkt_available
+
+def gold_accuracy(tokenizer, lang):
+    paragraphs = TOKENIZER_CORPUS[lang]
+    correct = sum(tokenizer.sent_tokenize(' '.join(gold), lang) == gold for gold in paragraphs)
+    return correct / len(paragraphs)
+
+def throughput(tokenizer, text, lang, repeats):
+    # Best-of-N words per second for sentence splitting plus word extraction
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tokenizer.sent_tokenize(text, lang)
+        words = tokenizer.words(text, lang)
+        best = min(best, time.perf_counter() - start)
+    return len(words) / best
+
+def main():
+    parser = argparse.ArgumentParser(description='Regex vs NLTK tokenizer parity and throughput')
+    parser.add_argument('--words', type=int, default=200_000, help='Words per language for the throughput run')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--min-gold-accuracy', type=float, default=1.0, help='Fraction of corpus paragraphs split exactly')
+    parser.add_argument('--max-word-drift', type=float, default=0.02, help='Relative word-count difference from NLTK')
+    args = parser.parse_args()
+
+    setup_nltk()
+    regex = get_tokenizer('regex')
+    nltk = get_tokenizer('nltk') if punkt_available() else None
+    if nltk is None:
+        print("punkt not available; NLTK columns skipped")
+
+    failed = False
+    print(f"{'lang':4} {'backend':7} {'gold splits':>11} {'words':>7} {'words/s':>12}")
+    for lang in TOKENIZER_CORPUS:
+        text = corpus_text(lang)
+        # The throughput seeds exist for ru/en; kk is timed on its own corpus
+        large = generate_corpus(lang, args.words) if lang in ('ru', 'en') else '\n'.join([text] * max(1, args.words // 150))
+        regex_words = len(regex.words(text, lang))
+        regex_accuracy = gold_accuracy(regex, lang)
+        print(f"{lang:4} {'regex':7} {regex_accuracy:11.0%} {regex_words:7d} {throughput(regex, large, lang, args.repeats):12,.0f}")
+        if regex_accuracy < args.min_gold_accuracy:
+            failed = True
+
+        if nltk is not None:
+            nltk_words = len(nltk.words(text, lang))
+            print(f"{lang:4} {'nltk':7} {gold_accuracy(nltk, lang):11.0%} {nltk_words:7d} {throughput(nltk, large, lang, args.repeats):12,.0f}")
+            drift = abs(regex_words - nltk_words) / max(1, nltk_words)
+            print(f"{lang:4} word-count drift {drift:.2%} (bound {args.max_word_drift:.2%})")
+            if drift > args.max_word_drift:
+                failed = True
+
+    if failed:
+        print("PARITY FAILED")
+        sys.exit(1)
+    print("parity ok")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_translator_registry.py
+#
+# Cold start and per-request overhead of resolving an Argos translation:
+# the old path (enumerate installed languages on every request) against the
+# warm registry in utils/translator_registry.py. Needs the packages from
+# install_language_packages.py.
+#
+#   python -m benchmarks.bench_translator_registry --requests 200
+
+import argparse
+import statistics
+import time
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def per_request_overhead(func, src_lang, tgt_lang, requests):
+    timings = []
+    for _ in range(requests):
+        _, elapsed = timed(func, src_lang, tgt_lang)
+        timings.append(elapsed)
+    return statistics.median(timings), max(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Translator registry cold start and per-request overhead')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--src', default='ru')
+    parser.add_argument('--tgt', default='en')
+    args = parser.parse_args()
+
+    _, import_time = timed(__import__, 'argostranslate.translate')
+    from utils.translator_registry import get_translation, load_translation, clear_translations
+
+    clear_translations()
+    translation, cold_time = timed(get_translation, args.src, args.tgt)
+    if translation is None:
+        raise SystemExit(f"No Argos package installed for {args.src} -> {args.tgt}.")
+    _, first_translate_time = timed(translation.translate, "Тест.")
+
+    old_median, old_max = per_request_overhead(load_translation, args.src, args.tgt, args.requests)
+    new_median, new_max = per_request_overhead(get_translation, args.src, args.tgt, args.requests)
+
+    print(f"import argostranslate:        {import_time * 1000:9.2f} ms")
+    print(f"cold registry lookup:         {cold_time * 1000:9.2f} ms")
+    print(f"first translate (model load): {first_translate_time * 1000:9.2f} ms")
+    print(f"per request, old lookup:      {old_median * 1000:9.3f} ms median, {old_max * 1000:.3f} ms max")
+    print(f"per request, warm registry:   {new_median * 1000:9.3f} ms median, {new_max * 1000:.3f} ms max")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/compare.py
+#
+# Compares two result files from benchmarks/run_all.py, e.g. the parent
+# commit against the current one. Prints the median time change per
+# benchmark and exits non-zero when any benchmark got slower than the
+# threshold, so it can gate a CI job.
+#
+#   python -m benchmarks.run_all --output base.json   # on the base commit
+#   python -m benchmarks.run_all --output head.json   # on the new commit
+#   python -m benchmarks.compare base.json head.json --threshold 0.10
+
+import argparse
+import json
+
+# Differences in these make the timings of two runs not directly comparable
+ENVIRONMENT_KEYS = ('python', 'platform', 'cpu_count', 'tokenizer')
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    results = {(r['name'], r['lang'], r['size']): r for r in report['results']}
+    return report['environment'], results
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed slowdown, as a fraction of the baseline')
+    parser.add_argument('--min-ms', type=float, default=0.5, help='Ignore benchmarks faster than this in both runs')
+    args = parser.parse_args()
+
+    base_env, base = load(args.baseline)
+    head_env, head = load(args.current)
+    print(f"baseline {base_env.get('commit', '?')[:10]}{' (dirty)' if base_env.get('dirty') else ''}"
+          f" -> current {head_env.get('commit', '?')[:10]}{' (dirty)' if head_env.get('dirty') else ''}")
+    for key in ENVIRONMENT_KEYS:
+        if base_env.get(key) != head_env.get(key):
+            print(f"warning: {key} differs ({base_env.get(key)} vs {head_env.get(key)})")
+
+    regressions = []
+    print(f"\n{'size':>6} {'lang':4} {'benchmark':34} {'baseline':>11} {'current':>11} {'change':>8}")
+    for key in sorted(base.keys() & head.keys(), key=lambda k: (k[0], k[1], base[k]['bytes'])):
+        before = base[key]['median_s'] * 1000
+        after = head[key]['median_s'] * 1000
+        change = after / before - 1 if before else 0.0
+        flag = ''
+        if max(before, after) >= args.min_ms and change > args.threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        name, lang, size = key
+        print(f"{size:>6} {lang:4} {name:34} {before:8.2f} ms {after:8.2f} ms {change:+8.1%}{flag}")
+
+    for label, keys in (('only in baseline', base.keys() - head.keys()), ('only in current', head.keys() - base.keys())):
+        if keys:
+            print(f"\n{len(keys)} result(s) {label}, not compared")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the {args.threshold:.0%} threshold.")
+        raise SystemExit(1)
+    print(f"\nNo regressions above {args.threshold:.0%}.")
+
+if __name__ == '__main__':
+    main()
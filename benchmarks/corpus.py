@@ -0,0 +1,141 @@
+# benchmarks/corpus.py
+
+import random
+from itertools import accumulate
+
+# Seed sentences in the register of the documents we actually process
+# (contracts, monthly and annual reports)
+SEED_SENTENCES = {
+    'ru': [
+        "Настоящий договор вступает в силу с момента его подписания обеими сторонами.",
+        "Выручка компании за отчётный период увеличилась на двенадцать процентов.",
+        "Стороны обязуются соблюдать конфиденциальность полученной информации.",
+        "Операционные расходы снизились благодаря оптимизации логистических процессов.",
+        "Все споры разрешаются путём переговоров, а при недостижении согласия в судебном порядке.",
+        "Совет директоров утвердил инвестиционную программу на следующий год.",
+        "Чистая прибыль составила три миллиарда тенге.",
+        "Исполнитель предоставляет заказчику ежемесячный отчёт о выполненных работах.",
+        "Кредитный портфель банка вырос за счёт корпоративного сегмента.",
+        "Изменения и дополнения к договору действительны лишь при условии их письменного оформления.",
+        "Рентабельность собственного капитала осталась на уровне прошлого года.",
+        "Компания продолжает реализацию стратегии устойчивого развития.",
+    ],
+    'en': [
+        "This agreement shall enter into force upon signature by both parties.",
+        "Company revenue for the reporting period increased by twelve percent.",
+        "The parties undertake to keep the information received confidential.",
+        "Operating expenses decreased due to the optimization of logistics processes.",
+        "All disputes shall be resolved through negotiation or, failing agreement, in court.",
+        "The board of directors approved the investment programme for the next year.",
+        "Net profit amounted to three billion tenge.",
+        "The contractor provides the customer with a monthly report on the work performed.",
+        "The loan portfolio of the bank grew on the back of the corporate segment.",
+        "Amendments to this agreement are valid only if made in writing.",
+        "Return on equity remained at the level of the previous year.",
+        "The company continues to implement its sustainable development strategy.",
+    ],
+    'kk': [
+        "Осы шарт тараптар қол қойған сәттен бастап күшіне енеді.",
+        "Есепті кезеңде компанияның түсімі он екі пайызға өсті.",
+        "Тараптар алынған ақпараттың құпиялылығын сақтауға міндеттенеді.",
+        "Логистикалық процестерді оңтайландыру арқасында операциялық шығыстар азайды.",
+        "Барлық даулар келіссөздер арқылы, ал келісімге қол жеткізілмеген жағдайда сот тәртібімен шешіледі.",
+        "Директорлар кеңесі келесі жылға арналған инвестициялық бағдарламаны бекітті.",
+        "Таза пайда үш миллиард теңгені құрады.",
+        "Орындаушы тапсырыс берушіге орындалған жұмыстар туралы ай сайынғы есеп ұсынады.",
+        "Банктің несие портфелі корпоративтік сегмент есебінен өсті.",
+        "Шартқа енгізілетін өзгерістер мен толықтырулар жазбаша түрде ресімделген жағдайда ғана жарамды.",
+        "Меншікті капитал рентабельділігі өткен жылдың деңгейінде қалды.",
+        "Компания тұрақты даму стратегиясын іске асыруды жалғастыруда.",
+    ],
+}
+
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+# Letters for the made-up words that fill out the vocabulary in zipf_words
+WORD_LETTERS = {
+    'ru': ("бвгджзклмнпрстфхцчшщ", "аеиоуыэюя"),
+    'en': ("bcdfghjklmnprstvwz", "aeiouy"),
+    'kk': ("бгджзйклмнпрстшқғң", "аеіоұүыөә"),
+}
+
+def generate_corpus(lang, num_words, seed=0, sentences_per_paragraph=5):
+    # Shuffled seed sentences grouped into paragraphs until num_words is reached
+    rng = random.Random(seed)
+    sentences = SEED_SENTENCES[lang]
+    paragraphs = []
+    paragraph = []
+    words = 0
+    while words < num_words:
+        sentence = rng.choice(sentences)
+        paragraph.append(sentence)
+        words += len(sentence.split())
+        if len(paragraph) == sentences_per_paragraph:
+            paragraphs.append(' '.join(paragraph))
+            paragraph = []
+    if paragraph:
+        paragraphs.append(' '.join(paragraph))
+    return '\n'.join(paragraphs)
+
+def parse_size(size):
+    # '1KB', '250KB', '100MB' -> bytes
+    size = size.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if size.endswith(unit):
+            return int(float(size[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(size)
+
+def generate_sized_corpus(lang, num_bytes, seed=0, sentences_per_paragraph=5, unique_share=0.5, vocabulary=50_000):
+    # Like generate_corpus, but sized in UTF-8 bytes (1 KB up to 100 MB and
+    # beyond); stops at the first whole sentence that reaches num_bytes.
+    # unique_share of the sentences are made of Zipf-sampled words (see
+    # zipf_words) and practically never repeat, so distinct sentences and
+    # words grow with the corpus; the rest are seed sentences, which keep the
+    # register and make repeats that caches can hit.
+    rng = random.Random(seed)
+    sentences = SEED_SENTENCES[lang]
+    words, cum_weights = zipf_vocabulary(lang, vocabulary, seed=seed)
+    paragraphs = []
+    paragraph = []
+    total = 0
+    while total < num_bytes:
+        if rng.random() < unique_share:
+            sampled = rng.choices(words, cum_weights=cum_weights, k=rng.randint(6, 16))
+            sentence = ' '.join(sampled).capitalize() + '.'
+        else:
+            sentence = rng.choice(sentences)
+        paragraph.append(sentence)
+        # +1 for the space or newline that follows each sentence
+        total += len(sentence.encode('utf-8')) + 1
+        if len(paragraph) == sentences_per_paragraph:
+            paragraphs.append(' '.join(paragraph))
+            paragraph = []
+    if paragraph:
+        paragraphs.append(' '.join(paragraph))
+    return '\n'.join(paragraphs)
+
+def corpus_words(text):
+    return [word.strip('.,;:!?()"«»') for word in text.split() if word.strip('.,;:!?()"«»').isalpha()]
+
+def zipf_vocabulary(lang, vocabulary=50_000, exponent=1.0, seed=0):
+    # (words, cumulative Zipf weights) for a vocabulary of the given size, like
+    # word frequencies in real text: the seed sentences' words take the top
+    # ranks, made-up words of one to five syllables fill the long tail
+    rng = random.Random(seed)
+    consonants, vowels = WORD_LETTERS[lang]
+    words = list(dict.fromkeys(word.lower() for word in corpus_words(' '.join(SEED_SENTENCES[lang]))))
+    seen = set(words)
+    while len(words) < vocabulary:
+        word = ''.join(
+            rng.choice(consonants) + rng.choice(vowels) + (rng.choice(consonants) if rng.random() < 0.3 else '')
+            for _ in range(rng.randint(1, 5))
+        )
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words, list(accumulate(1 / rank ** exponent for rank in range(1, len(words) + 1)))
+
+def zipf_words(lang, num_words, vocabulary=50_000, exponent=1.0, seed=0):
+    # num_words words drawn from zipf_vocabulary
+    words, cum_weights = zipf_vocabulary(lang, vocabulary, exponent, seed)
+    return random.Random(seed).choices(words, cum_weights=cum_weights, k=num_words)
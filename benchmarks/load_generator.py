@@ -0,0 +1,78 @@
+# benchmarks/load_generator.py
+#
+# Local load generator for api_server.py. Sends --requests requests with
+# --concurrency in flight and reports throughput and p50/p99 latency, plus
+# the server's own batching statistics. Request texts are made of
+# Zipf-sampled words, so /translate requests are not all answered from the
+# server's translation memory; use a new --seed for each run against the same
+# server, or the repeated sentences will be.
+#
+#   python api_server.py --port 8080 &
+#   python -m benchmarks.load_generator --endpoint translate --requests 500 --concurrency 32
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import aiohttp
+from benchmarks.corpus import zipf_vocabulary
+from utils.micro_batcher import latency_percentiles
+
+def make_sentence(vocabulary, rng):
+    words, cum_weights = vocabulary
+    return ' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(6, 16))).capitalize() + '.'
+
+def make_payload(endpoint, vocabularies, rng):
+    lang = rng.choice(('ru', 'en'))
+    text = ' '.join(make_sentence(vocabularies[lang], rng) for _ in range(rng.randint(1, 4)))
+    if endpoint == 'translate':
+        return {'text': text, 'src_lang': lang, 'tgt_lang': 'en' if lang == 'ru' else 'ru'}
+    return {'text': text, 'lang': lang}
+
+async def run(url, endpoint, requests, concurrency, seed):
+    rng = random.Random(seed)
+    vocabularies = {lang: zipf_vocabulary(lang, seed=seed) for lang in ('ru', 'en')}
+    payloads = [make_payload(endpoint, vocabularies, rng) for _ in range(requests)]
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(session, payload):
+        async with semaphore:
+            start = time.perf_counter()
+            async with session.post(f"{url}/{endpoint}", json=payload) as response:
+                await response.read()
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+            if response.status == 200:
+                latencies.append(time.perf_counter() - start)
+
+    timeout = aiohttp.ClientTimeout(total=None)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(session, payload) for payload in payloads))
+        elapsed = time.perf_counter() - start
+        async with session.get(f"{url}/stats") as response:
+            server_stats = await response.json()
+    return latencies, statuses, elapsed, server_stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Load generator for api_server.py')
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--endpoint', choices=('translate', 'sentiment', 'readability'), default='translate')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    latencies, statuses, elapsed, server_stats = asyncio.run(
+        run(args.url, args.endpoint, args.requests, args.concurrency, args.seed)
+    )
+    percentiles = latency_percentiles(latencies)
+    print(f"{args.endpoint}: {args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f}s")
+    print(f"throughput {len(latencies) / elapsed:.1f} req/s | statuses {statuses}")
+    print(f"client latency p50 {percentiles['p50'] * 1000:.1f} ms | p99 {percentiles['p99'] * 1000:.1f} ms")
+    print("server stats:", json.dumps(server_stats, indent=2))
+
+if __name__ == '__main__':
+    main()
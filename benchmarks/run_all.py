@@ -0,0 +1,213 @@
+# benchmarks/run_all.py
+#
+# Reproducible benchmark suite: read_file for each format, language
+# detection, tokenization, every readability index, syllable counting,
+# sentiment and translation, on generated ru/en/kk corpora of the given sizes.
+# Sentiment and translation use the deterministic stubs from
+# benchmarks/stubs.py, so the suite runs offline and without a GPU, and
+# measures the pipeline code rather than the models. Results are written as
+# JSON; compare two runs with benchmarks/compare.py.
+#
+#   python -m benchmarks.run_all --sizes 1KB,1MB --output results.json
+#   python -m benchmarks.run_all --sizes 100MB --only read_file,detect_language
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import textwrap
+import time
+from datetime import datetime, timezone
+from functools import cached_property
+from benchmarks.corpus import SEED_SENTENCES, generate_sized_corpus, parse_size
+from benchmarks.stubs import StubSentimentAnalyzer, StubTranslator
+from utils import readability_indices, translation_memory
+from utils.file_readers import read_file
+from utils.readability_indices import sentence_scores
+from utils.sentiment import analyze_sentiment
+from utils.text_processing import count_syllables_batch, detect_language, _count_syllables_cached
+from utils.text_stats import compute_text_stats
+from utils.tokenizers import get_tokenizer
+from utils.translation_pipeline import translate_document
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDICES = ['flesch_reading_ease', 'flesch_kincaid_grade_level', 'gunning_fog_index', 'smog_index']
+TRANSLATION_TARGETS = {'ru': 'en', 'en': 'ru', 'kk': 'ru'}
+PDF_LINES_PER_PAGE = 60
+
+def build_docx(text):
+    import docx
+    doc = docx.Document()
+    for paragraph in text.split('\n'):
+        doc.add_paragraph(paragraph)
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+def _escape_pdf(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def build_pdf(text):
+    # Minimal uncompressed PDF with the standard Helvetica font, which only
+    # covers Latin text; used for the English corpus
+    lines = [line for paragraph in text.split('\n') for line in textwrap.wrap(paragraph, 90)]
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+    # 1: catalog, 2: page tree, 3: font, then a page and its content stream per page
+    objects = [
+        None,
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    kids = []
+    for page in pages:
+        body = 'BT /F1 10 Tf 12 TL 40 800 Td ' + ' '.join(f'({_escape_pdf(line)}) Tj T*' for line in page) + ' ET'
+        stream = body.encode('latin-1', 'replace')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>'.encode()
+        )
+        kids.append(f'{len(objects)} 0 R')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'.encode()
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b'%d 0 obj\n' % number + obj + b'\nendobj\n')
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b'%010d 00000 n \n' % offset)
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+class Inputs:
+    # Everything the benchmarks of one (language, size) need, built on first use
+    def __init__(self, lang, num_bytes, seed):
+        self.lang = lang
+        self.text = generate_sized_corpus(lang, num_bytes, seed)
+
+    @cached_property
+    def txt(self):
+        return self.text.encode('utf-8')
+
+    @cached_property
+    def docx(self):
+        return build_docx(self.text)
+
+    @cached_property
+    def pdf(self):
+        return build_pdf(self.text)
+
+    @cached_property
+    def stats(self):
+        return compute_text_stats(self.text, self.lang)
+
+def _fresh_translation_memory():
+    # Every translation run starts with an empty in-memory translation memory,
+    # so runs are comparable and the app's memory on disk is left alone
+    translation_memory._translation_memory = translation_memory.TranslationMemory(':memory:')
+
+def benchmarks(inputs):
+    # [(name, func, setup or None)] for one (language, size)
+    lang = inputs.lang
+    cases = [
+        ('read_file:txt', lambda: read_file(inputs.txt), None),
+        ('read_file:docx', lambda: read_file(inputs.docx), None),
+    ]
+    if lang == 'en':
+        cases.append(('read_file:pdf', lambda: read_file(inputs.pdf), None))
+    cases += [
+        ('detect_language', lambda: detect_language(inputs.text), None),
+        ('text_stats', lambda: compute_text_stats(inputs.text, lang), None),
+        ('count_syllables', lambda: count_syllables_batch(inputs.stats.words, lang), _count_syllables_cached.cache_clear),
+    ]
+    for index in INDICES:
+        func = getattr(readability_indices, index)
+        cases.append((f'index:{index}', lambda func=func: func(inputs.text, lang), None))
+    cases += [
+        ('sentence_scores', lambda: sentence_scores(*inputs.stats.sentence_arrays(), lang), None),
+        ('sentiment', lambda: analyze_sentiment(inputs.text, StubSentimentAnalyzer(), lang), None),
+        (
+            'translation',
+            lambda: translate_document(inputs.text, lang, TRANSLATION_TARGETS[lang], StubTranslator(), workers=1),
+            _fresh_translation_memory,
+        ),
+    ]
+    return cases
+
+def measure(func, setup, repeats):
+    # One untimed warm-up run (imports, dictionaries), then `repeats` timed runs
+    if setup:
+        setup()
+    func()
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+def environment():
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'tokenizer': get_tokenizer().name,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite with generated corpora and stub models')
+    parser.add_argument('--sizes', default='1KB,100KB,1MB', help='Corpus sizes, e.g. 1KB,1MB,100MB')
+    parser.add_argument('--langs', default=','.join(SEED_SENTENCES))
+    parser.add_argument('--only', help='Comma-separated benchmark name prefixes, e.g. read_file,index')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the results as JSON to this path')
+    args = parser.parse_args()
+    prefixes = args.only.split(',') if args.only else None
+
+    results = []
+    for size in args.sizes.split(','):
+        num_bytes = parse_size(size)
+        for lang in args.langs.split(','):
+            inputs = Inputs(lang, num_bytes, args.seed)
+            for name, func, setup in benchmarks(inputs):
+                if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                    continue
+                times = measure(func, setup, args.repeats)
+                median = statistics.median(times)
+                results.append({
+                    'name': name, 'lang': lang, 'size': size, 'bytes': len(inputs.txt),
+                    'repeats': args.repeats, 'median_s': median, 'min_s': min(times),
+                    'mb_per_s': len(inputs.txt) / median / 1e6 if median else None,
+                })
+                print(f"{size:>6} {lang} {name:34} {median * 1000:10.2f} ms  {results[-1]['mb_per_s'] or 0:8.2f} MB/s")
+                sys.stdout.flush()
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/stubs.py
+#
+# Deterministic local stand-ins for the models, so the benchmark suite runs
+# offline, without a GPU and without downloaded packages. They implement just
+# the interface the pipeline code calls: translate() of an Argos translation,
+# and the tokenizer and batched __call__ of a transformers sentiment pipeline.
+# Outputs depend only on the input text; an optional fixed cost per call
+# stands in for inference time.
+
+import time
+import zlib
+
+SENTIMENT_LABELS = ('Positive', 'Negative', 'Neutral')
+
+class StubTranslator:
+    # Argos translation stand-in: reverses the word order
+    def __init__(self, cost=0.0):
+        self.cost = cost
+        self.calls = 0
+
+    def translate(self, sentence):
+        self.calls += 1
+        if self.cost:
+            time.sleep(self.cost)
+        return ' '.join(reversed(sentence.split()))
+
+class StubTokenizer:
+    # Whitespace tokenizer with the parts of the transformers tokenizer API
+    # that utils.sentiment uses; ids are assigned on first sight
+    def __init__(self):
+        self._ids = {}
+        self._words = []
+
+    def _id(self, word):
+        token_id = self._ids.get(word)
+        if token_id is None:
+            token_id = self._ids[word] = len(self._words)
+            self._words.append(word)
+        return token_id
+
+    def __call__(self, texts, add_special_tokens=True):
+        return {'input_ids': [[self._id(word) for word in text.split()] for text in texts]}
+
+    def decode(self, ids):
+        return ' '.join(self._words[i] for i in ids)
+
+class StubSentimentAnalyzer:
+    # transformers sentiment pipeline stand-in: label probabilities derived
+    # from a checksum of the text, so the same chunk always gets the same scores
+    def __init__(self, cost_per_chunk=0.0):
+        self.tokenizer = StubTokenizer()
+        self.cost_per_chunk = cost_per_chunk
+        self.calls = 0
+
+    def _scores(self, text):
+        checksum = zlib.crc32(text.encode('utf-8'))
+        weights = [1 + (checksum >> shift) % 97 for shift in (0, 8, 16)]
+        total = sum(weights)
+        return [{'label': label, 'score': weight / total} for label, weight in zip(SENTIMENT_LABELS, weights)]
+
+    def __call__(self, texts, batch_size=1, truncation=True, top_k=None):
+        if isinstance(texts, str):
+            texts = [texts]
+        self.calls += 1
+        if self.cost_per_chunk:
+            time.sleep(self.cost_per_chunk * len(texts))
+        return [self._scores(text) for text in texts]
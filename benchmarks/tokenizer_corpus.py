@@ -0,0 +1,78 @@
+# benchmarks/tokenizer_corpus.py
+#
+# Hand-split paragraphs for checking sentence tokenizers: each entry is the
+# list of sentences a paragraph should be split into. Covers abbreviations,
+# initials, dotted forms, numbers, quotes and ellipses in the three
+# languages we analyse.
+
+TOKENIZER_CORPUS = {
+    'en': [
+        ["This agreement shall enter into force upon signature by both parties.",
+         "It remains valid until 31 December 2025."],
+        ["Mr. J. R. Smith, the chief financial officer, signed the report on Jan. 15.",
+         "Dr. Brown approved it the next day."],
+        ["Revenue grew by 12.5% compared to the previous year.",
+         "Operating expenses, e.g. logistics and rent, decreased."],
+        ["The U.S. subsidiary reported a net loss of 3.2 million dollars.",
+         "Management expects a recovery in the second half."],
+        ["The contract covers software, hardware, support, etc.",
+         "Any changes must be agreed in writing."],
+        ["Was the deadline met?",
+         "No, the delivery was postponed by two weeks!",
+         "The customer accepted the delay."],
+        ["The auditor wrote: \"All statements are fair and complete.\"",
+         "The board accepted the opinion."],
+        ["Payment is due within 30 days, i.e. by the end of the month.",
+         "Late payments accrue interest at 0.1% per day."],
+        ["Shares of Apple Inc. rose sharply.",
+         "Analysts at Goldman Sachs & Co. raised their targets."],
+        ["The results were mixed... but the outlook remains positive.",
+         "See Fig. 3 and pp. 12-14 for details."],
+    ],
+    'ru': [
+        ["Настоящий договор вступает в силу с момента его подписания обеими сторонами.",
+         "Он действует до 31 декабря 2025 г. включительно."],
+        ["Отчёт подписал финансовый директор А. С. Иванов.",
+         "Совет директоров утвердил его на следующий день."],
+        ["Выручка выросла на 12,5% по сравнению с 2023 г. и составила 4,2 млрд тенге.",
+         "Расходы снизились."],
+        ["В расходы включены аренда, логистика, связь и т.д.",
+         "Подробности приведены в приложении."],
+        ["Операционные расходы, т.е. расходы на персонал и аренду, снизились на 3%.",
+         "Прибыль выросла."],
+        ["Офис расположен по адресу: г. Алматы, ул. Абая, д. 10.",
+         "Приём посетителей ведётся ежедневно."],
+        ["Был ли соблюдён срок?",
+         "Нет, поставка перенесена на две недели!",
+         "Заказчик согласился с переносом."],
+        ["Аудитор указал: «Отчётность достоверна во всех существенных аспектах.»",
+         "Совет принял заключение."],
+        ["Результаты неоднозначны... но прогноз остаётся положительным.",
+         "См. рис. 3 на с. 12."],
+        ["Кредитный портфель составил 850 млрд.",
+         "Доля проблемных займов снизилась."],
+    ],
+    'kk': [
+        ["Осы шарт екі тарап қол қойған сәттен бастап күшіне енеді.",
+         "Ол 2025 ж. 31 желтоқсанға дейін жарамды."],
+        ["Есепке қаржы директоры Н. Ә. Назарбаев қол қойды.",
+         "Директорлар кеңесі оны келесі күні бекітті."],
+        ["Кіріс 12,5%-ға өсіп, 4,2 млрд теңгені құрады.",
+         "Шығыстар азайды."],
+        ["Шығыстарға жалдау, логистика, байланыс т.б. кіреді.",
+         "Толығырақ ақпарат қосымшада берілген."],
+        ["Кеңсе Алматы қ., Абай көш., 10 мекенжайында орналасқан.",
+         "Келушілер күн сайын қабылданады."],
+        ["Мерзім сақталды ма?",
+         "Жоқ, жеткізу екі аптаға шегерілді!",
+         "Тапсырыс беруші келісті."],
+        ["Аудитор былай деп жазды: «Есептілік барлық маңызды аспектілерде дұрыс.»",
+         "Кеңес қорытындыны қабылдады."],
+        ["Нәтижелер әртүрлі... бірақ болжам оң күйінде қалып отыр.",
+         "Компания тұрақты даму стратегиясын жүзеге асыруды жалғастыруда."],
+    ],
+}
+
+def corpus_text(lang):
+    # The whole corpus of one language as a document, one paragraph per line
+    return '\n'.join(' '.join(sentences) for sentences in TOKENIZER_CORPUS[lang])
@@ -0,0 +1,49 @@
+# install_language_packages.py
+#
+# Explicit setup step: downloads and installs the Argos Translate packages the
+# app needs. The app itself never installs packages, so it can run offline.
+
+import argparse
+import logging
+import argostranslate.package
+import argostranslate.translate
+
+logging.basicConfig(level=logging.INFO)
+
+LANGUAGE_PAIRS = [('en', 'ru'), ('ru', 'en')]
+
+def is_installed(from_code, to_code):
+    installed_languages = argostranslate.translate.get_installed_languages()
+    from_lang = next((lang for lang in installed_languages if lang.code == from_code), None)
+    to_lang = next((lang for lang in installed_languages if lang.code == to_code), None)
+    return bool(from_lang and to_lang and from_lang.get_translation(to_lang))
+
+def install_language_package(from_code, to_code, update_index=False):
+    if update_index:
+        argostranslate.package.update_package_index()
+
+    available_packages = argostranslate.package.get_available_packages()
+    package_to_install = next(
+        (pkg for pkg in available_packages if pkg.from_code == from_code and pkg.to_code == to_code),
+        None
+    )
+    if package_to_install is None:
+        logging.error(f"No language package found for translation from '{from_code}' to '{to_code}'.")
+        return False
+    argostranslate.package.install_from_path(package_to_install.download())
+    logging.info(f"Installed language package '{from_code}' -> '{to_code}'.")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Install the Argos Translate packages used by the app')
+    parser.add_argument('--update-index', action='store_true', help='Refresh the package index first')
+    args = parser.parse_args()
+
+    for from_code, to_code in LANGUAGE_PAIRS:
+        if is_installed(from_code, to_code):
+            logging.info(f"Language package '{from_code}' -> '{to_code}' is already installed.")
+        else:
+            install_language_package(from_code, to_code, update_index=args.update_index)
+
+if __name__ == '__main__':
+    main()
@@ -5,43 +5,71 @@ import logging
 # Set page configuration
 st.set_page_config(page_title="Анализ Понятности и Перевод Текста", layout="wide")
 logging.basicConfig(level=logging.DEBUG)
-import os
-import tempfile
 import io
-from docx import Document
+import os
+import time
 
-# Import modules after setting page config
+# Import modules after setting page config. Only light modules are imported
+# here; docx, NumPy, NLTK and the models load when a feature first needs them.
 from models.nltk_resources import setup_nltk
-from models.transformers_models import load_sentiment_analyzer
-from utils.file_readers import read_file
-from utils.text_processing import detect_language
-from utils.readability_indices import (
-    flesch_reading_ease,
-    flesch_kincaid_grade_level,
-    gunning_fog_index,
-    smog_index,
-)
-from utils.formatting import color_code_index
-from utils.argos_translate import translate_text
-
-@st.cache_resource
-def load_sentiment_analyzer_cached():
-    analyzer = load_sentiment_analyzer()
-    if not analyzer:
-        st.error("Ошибка при загрузке модели для анализа тональности.")
-    return analyzer
+from models.transformers_models import SENTIMENT_MODEL_VERSION
+from utils.file_readers import read_file, detect_format
+from utils.tokenizers import get_tokenizer
+from utils.text_processing import detect_language_with_confidence, detect_paragraph_languages
+from utils.formatting import color_code_index, highlight_sentences
+from utils.argos_translate import translation_model_version
+from utils.translation_pipeline import count_paragraphs
+from utils.result_cache import get_result_cache, content_hash, make_key
+from utils.jobs import get_job_manager, MODEL_CONCURRENCY, DONE, FAILED, CANCELLED, FINISHED_STATUSES
+from utils.runtime_config import get_runtime_config
+from utils.prewarm import PREWARM_ENABLED, start_prewarm
+from utils import metrics
 
-def main():
-    # Setup NLTK resources
-    setup_nltk()
+# Seconds between polls of a running background job
+JOB_POLL_INTERVAL = 1.0
+# Sentences per page of the highlighted view; the browser slows down on huge HTML blocks
+SENTENCES_PER_PAGE = 300
+
+# Streamlit reruns main() on every widget interaction; these results are
+# reused for identical content instead of being recomputed
+def read_upload_cached(uploaded_file):
+    key = make_key('extract', content_hash(uploaded_file.getbuffer()))
+    return get_result_cache().get_or_compute(key, lambda: read_file(uploaded_file))
+
+def detect_language_cached(text):
+    # (lang, confidence, other languages found in individual paragraphs)
+    def detect():
+        lang, confidence = detect_language_with_confidence(text)
+        others = {p_lang for _, p_lang, _ in detect_paragraph_languages(text) if p_lang and p_lang != lang}
+        return lang, confidence, sorted(others)
+    key = make_key('detect-v3', content_hash(text))
+    return get_result_cache().get_or_compute(key, detect)
 
-    # Load models
-    sentiment_analyzer = load_sentiment_analyzer_cached()
+LANGUAGE_NAMES = {'ru': 'Русский', 'en': 'Английский', 'kk': 'Казахский'}
 
+def show_detected_language(label, lang, confidence, others):
+    st.info(f"{label}: **{LANGUAGE_NAMES[lang]}** (уверенность {confidence:.0%})")
+    if others:
+        st.warning(
+            "Документ содержит абзацы на других языках: " + ", ".join(LANGUAGE_NAMES[o] for o in others)
+        )
+
+def tokenizer_name():
+    # Part of the analysis cache key; NLTK is set up on first use of the
+    # analysis mode, once per process, and get_tokenizer caches the backend
+    setup_nltk()
+    return get_tokenizer().name
+
+def main():
     # Define the rest of your main function
     st.title("Анализ Понятности Текста и Перевод")
     st.sidebar.header("Настройки")
-    functionality = st.sidebar.radio("Выберите функциональность", ("Анализ удобочитаемости", "Перевод"))
+    functionality = st.sidebar.radio(
+        "Выберите функциональность", ("Анализ удобочитаемости", "Перевод"), key='functionality'
+    )
+    show_runtime_config()
+    if metrics.is_enabled():
+        show_metrics_panel()
 
     if functionality == "Перевод":
         # Translation functionality
@@ -50,18 +78,15 @@ def main():
             "Выберите способ ввода текста для перевода", ("Загрузить файл", "Вставить текст")
         )
         translate_text_input = ""
+        translate_uploaded_file = None
 
         if translate_input_method == "Загрузить файл":
             translate_uploaded_file = st.file_uploader(
                 "Выберите файл (.txt, .docx, .pdf)", type=["txt", "docx", "pdf"]
             )
             if translate_uploaded_file is not None:
-                suffix = os.path.splitext(translate_uploaded_file.name)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                    tmp_file.write(translate_uploaded_file.getbuffer())
-                    temp_file_path = tmp_file.name
-                translate_text_input = read_file(temp_file_path)
-                os.remove(temp_file_path)
+                # Read straight from the upload buffer; no temporary file
+                translate_text_input = read_upload_cached(translate_uploaded_file)
                 st.write("**Содержимое файла для перевода:**")
                 st.write(translate_text_input)
         else:
@@ -71,11 +96,9 @@ def main():
             auto_detect_translate = st.checkbox("Автоматически определить исходный язык", value=True)
 
             if auto_detect_translate:
-                detected_src_lang = detect_language(translate_text_input)
+                detected_src_lang, confidence, other_langs = detect_language_cached(translate_text_input)
                 if detected_src_lang in ['ru', 'en']:
-                    st.info(
-                        f"Автоматически определённый исходный язык: **{'Русский' if detected_src_lang == 'ru' else 'Английский'}**"
-                    )
+                    show_detected_language("Автоматически определённый исходный язык", detected_src_lang, confidence, other_langs)
                     src_lang = detected_src_lang
                 else:
                     st.warning(
@@ -95,31 +118,28 @@ def main():
 
             if available_tgt_langs:
                 tgt_lang = st.selectbox("Выберите целевой язык", available_tgt_langs)
-                if st.button("Перевести"):
-                    with st.spinner('Выполняется перевод...'):
-                        translated_text = translate_text(translate_text_input, src_lang, tgt_lang)
-                    if translated_text:
-                        st.subheader("Переведённый текст:")
-                        st.write(translated_text)
-
-                        # Create a Word document
-                        doc = Document()
-                        doc.add_paragraph(translated_text)
-
-                        # Save the document to a BytesIO object
-                        doc_io = io.BytesIO()
-                        doc.save(doc_io)
-                        doc_io.seek(0)
-
-                        # Provide the download button for the Word document
-                        st.download_button(
-                            label="Скачать переведённый текст",
-                            data=doc_io,
-                            file_name=f"translated_text.docx",
-                            mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-                        )
-                    else:
-                        st.warning("Перевод не выполнен. Пожалуйста, проверьте введенный текст и попробуйте снова.")
+                keep_layout = False
+                if translate_uploaded_file is not None and detect_format(translate_uploaded_file) == 'docx':
+                    keep_layout = st.checkbox("Сохранить структуру DOCX (таблицы, списки, колонтитулы)", value=True)
+
+                if keep_layout:
+                    file_hash = content_hash(translate_uploaded_file.getbuffer())
+                    key = make_key(
+                        'docx-translation', file_hash, src_lang, tgt_lang, translation_model_version(src_lang, tgt_lang),
+                    )
+                    if st.button("Перевести"):
+                        start_docx_job(key, file_hash, translate_uploaded_file, src_lang, tgt_lang)
+                    show_docx_translation(key)
+                else:
+                    key = make_key(
+                        'translation', content_hash(translate_text_input), src_lang, tgt_lang,
+                        translation_model_version(src_lang, tgt_lang),
+                    )
+                    if st.button("Перевести"):
+                        start_job('translation_job', key, 'translation', {
+                            'text': translate_text_input, 'src_lang': src_lang, 'tgt_lang': tgt_lang,
+                        })
+                    show_translation(key, count_paragraphs(translate_text_input))
             else:
                 st.warning("Выбранный исходный язык не поддерживается для перевода.")
 
@@ -132,12 +152,8 @@ def main():
         if input_method == "Загрузить файл":
             uploaded_file = st.file_uploader("Выберите файл (.txt, .docx, .pdf)", type=["txt", "docx", "pdf"])
             if uploaded_file is not None:
-                suffix = os.path.splitext(uploaded_file.name)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                    tmp_file.write(uploaded_file.getbuffer())
-                    temp_file_path = tmp_file.name
-                text = read_file(temp_file_path)
-                os.remove(temp_file_path)
+                # Read straight from the upload buffer; no temporary file
+                text = read_upload_cached(uploaded_file)
                 st.write("**Содержимое файла:**")
                 st.write(text)
         else:
@@ -147,72 +163,268 @@ def main():
             auto_detect = st.checkbox("Автоматически определить язык текста", value=True)
 
             if auto_detect:
-                detected_lang = detect_language(text)
-                if detected_lang in ['ru', 'en']:
-                    st.info(
-                        f"Автоматически определённый язык: **{'Русский' if detected_lang == 'ru' else 'Английский'}**"
-                    )
+                detected_lang, confidence, other_langs = detect_language_cached(text)
+                if detected_lang in ['ru', 'en', 'kk']:
+                    show_detected_language("Автоматически определённый язык", detected_lang, confidence, other_langs)
                     lang_code = detected_lang
                 else:
                     st.warning(
                         "Не удалось определить язык или язык не поддерживается. Пожалуйста, выберите язык вручную."
                     )
-                    lang_code = st.selectbox("Выберите язык текста", ("ru", "en"))
+                    lang_code = st.selectbox("Выберите язык текста", ("ru", "en", "kk"))
             else:
-                lang_code = st.selectbox("Выберите язык текста", ("ru", "en"))
+                lang_code = st.selectbox("Выберите язык текста", ("ru", "en", "kk"))
 
+            key = make_key('analysis', content_hash(text), lang_code, SENTIMENT_MODEL_VERSION, tokenizer_name())
             if st.button("Анализировать"):
-                analyze_readability(text, lang_code, sentiment_analyzer)
-
-def analyze_readability(text, lang_code, sentiment_analyzer):
-    fre = flesch_reading_ease(text, lang_code)
-    fkgl = flesch_kincaid_grade_level(text, lang_code)
-    fog = gunning_fog_index(text, lang_code)
-    smog = smog_index(text, lang_code)
-
-    if (lang_code == 'ru' or lang_code == 'en') and sentiment_analyzer is not None:
-        try:
-            sentiment = sentiment_analyzer(text)
-            sentiment_label = sentiment[0]['label']
-            sentiment_score = sentiment[0]['score']
-        except:
-            sentiment_label = "Не удалось выполнить анализ тональности."
-            sentiment_score = None
+                start_job('analysis_job', key, 'analysis', {'text': text, 'lang': lang_code})
+            show_analysis(key)
+
+    if PREWARM_ENABLED:
+        # Started after the first page is rendered, so it does not delay it
+        start_prewarm()
+
+def show_runtime_config():
+    # What the job workers apply when they start (utils/runtime_config.py)
+    with st.sidebar.expander("Конфигурация инференса"):
+        st.dataframe(
+            [{'pool': model, **get_runtime_config(workers)} for model, workers in MODEL_CONCURRENCY.items()],
+            use_container_width=True,
+        )
+
+def show_metrics_panel():
+    # Metrics of the UI process; job workers keep their own (see METRICS_DUMP_PATH)
+    with st.sidebar.expander("Метрики производительности"):
+        snapshot = metrics.snapshot()
+        if snapshot['timers']:
+            st.dataframe(snapshot['timers'], use_container_width=True)
+        if snapshot['counters']:
+            st.dataframe(snapshot['counters'], use_container_width=True)
+        if snapshot['gauges']:
+            st.dataframe(snapshot['gauges'], use_container_width=True)
+        st.download_button("Скачать в формате Prometheus", metrics.render_prometheus(), file_name="metrics.prom")
+
+def start_job(state_key, result_key, kind, payload):
+    # Cached results are shown directly; otherwise the work goes to a background job
+    st.session_state[state_key] = {'result_key': result_key, 'job_id': None}
+    found, _ = get_result_cache().get(result_key)
+    if not found:
+        st.session_state[state_key]['job_id'] = get_job_manager().submit(kind, payload)
+
+def poll_job(state_key, result_key):
+    # Returns (job, cached_result) for the job started for this exact input, if any
+    state = st.session_state.get(state_key)
+    if state is None or state['result_key'] != result_key:
+        return None, None
+    found, result = get_result_cache().get(result_key)
+    if found:
+        return None, result
+    if state['job_id'] is None:
+        return None, None
+    return get_job_manager().get(state['job_id']), None
+
+def show_job_status(job, cancel_label):
+    if job['status'] == FAILED:
+        st.error(f"Ошибка при выполнении задачи: {job['error']}")
+    elif job['status'] == CANCELLED:
+        st.info("Задача отменена.")
+    elif job['status'] not in FINISHED_STATUSES:
+        st.progress(job['progress'], text="Задача выполняется..." if job['progress'] else "Задача в очереди...")
+        if st.button(cancel_label):
+            get_job_manager().cancel(job['id'])
+
+def rerun_while_running(job):
+    # The script thread only sleeps between polls; the work itself runs in the job pool
+    if job is not None and job['status'] not in FINISHED_STATUSES:
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+
+def show_translation(result_key, total):
+    job, paragraphs = poll_job('translation_job', result_key)
+    if job is None and paragraphs is None:
+        return
+
+    st.subheader("Переведённый текст:")
+    if job is not None:
+        show_job_status(job, "Отменить перевод")
+        # Paragraphs finished so far, rendered while the rest is still being
+        # translated; each poll reads only the paragraphs added since the last one
+        received = st.session_state['translation_job'].setdefault('output', [])
+        received.extend(get_job_manager().output(job['id'], start=len(received)))
+        paragraphs = received
+        if job['status'] not in FINISHED_STATUSES:
+            st.caption(f"Переведено абзацев: {len(paragraphs)} из {total}")
+        if job['status'] in FINISHED_STATUSES:
+            # Later reruns read the result cache; the session keeps no copy
+            st.session_state['translation_job'].pop('output', None)
+        if job['status'] == DONE and any(p.strip() for p in paragraphs):
+            get_result_cache().put(result_key, paragraphs)
+
+    for paragraph in paragraphs:
+        st.write(paragraph)
+
+    if job is None or job['status'] == DONE:
+        if any(p.strip() for p in paragraphs):
+            # The Word document is only built once there is something to download
+            from docx import Document
+            with metrics.timer('docx_generation'):
+                doc = Document()
+                for paragraph in paragraphs:
+                    doc.add_paragraph(paragraph)
+                doc_io = io.BytesIO()
+                doc.save(doc_io)
+                doc_io.seek(0)
+
+            # Provide the download button for the Word document
+            st.download_button(
+                label="Скачать переведённый текст",
+                data=doc_io,
+                file_name=f"translated_text.docx",
+                mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+            )
+        else:
+            st.warning("Перевод не выполнен. Пожалуйста, проверьте введенный текст и попробуйте снова.")
+
+    rerun_while_running(job)
+
+def start_docx_job(result_key, file_hash, uploaded_file, src_lang, tgt_lang):
+    # Job payloads are JSON, so the upload is handed to the worker as a file
+    manager = get_job_manager()
+    input_path = manager.job_file(f"{file_hash}.docx")
+    if os.path.exists(input_path):
+        # Reused upload; a fresh mtime keeps JobManager.purge from removing it
+        os.utime(input_path)
     else:
-        sentiment_label = "Тональность не поддерживается для данного языка."
-        sentiment_score = None
+        with open(input_path, 'wb') as f:
+            f.write(uploaded_file.getbuffer())
+    start_job('docx_translation_job', result_key, 'docx_translation', {
+        'input_path': input_path,
+        'output_path': manager.job_file(f"{content_hash(result_key)}-translated.docx"),
+        'src_lang': src_lang,
+        'tgt_lang': tgt_lang,
+    })
+
+def show_docx_translation(result_key):
+    job, result = poll_job('docx_translation_job', result_key)
+    if job is not None:
+        show_job_status(job, "Отменить перевод")
+        if job['status'] == DONE:
+            with open(job['result']['output_path'], 'rb') as f:
+                result = dict(job['result'], data=f.read())
+            get_result_cache().put(result_key, result)
+    if result is not None:
+        st.caption(
+            f"Переведено фрагментов: {result['unique_segments']} уникальных из {result['segments']}"
+        )
+        st.download_button(
+            label="Скачать переведённый документ",
+            data=result['data'],
+            file_name="translated_document.docx",
+            mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        )
+    rerun_while_running(job)
+
+def show_analysis(result_key):
+    job, result = poll_job('analysis_job', result_key)
+    if job is not None:
+        show_job_status(job, "Отменить анализ")
+        if job['status'] == DONE:
+            result = job['result']
+            get_result_cache().put(result_key, result)
+    if result is not None:
+        render_analysis(result)
+    rerun_while_running(job)
+
+def render_analysis(result):
+    indices = result['indices']
+    sentiment = result['sentiment']
+    sentiment_status = result['sentiment_status']
 
     # Display results in Streamlit
     st.subheader("Результаты анализа")
 
     # Display indices with color coding
     st.markdown(
-        f"**Индекс удобочитаемости Флеша:** {color_code_index('Flesch Reading Ease', fre)}",
+        f"**Индекс удобочитаемости Флеша:** {color_code_index('Flesch Reading Ease', indices['flesch_reading_ease'])}",
         unsafe_allow_html=True,
     )
     st.markdown(
-        f"**Индекс Флеша-Кинкейда:** {color_code_index('Flesch-Kincaid Grade Level', fkgl)}",
+        f"**Индекс Флеша-Кинкейда:** {color_code_index('Flesch-Kincaid Grade Level', indices['flesch_kincaid_grade_level'])}",
         unsafe_allow_html=True,
     )
     st.markdown(
-        f"**Индекс тумана Ганнинга:** {color_code_index('Gunning Fog Index', fog)}",
+        f"**Индекс тумана Ганнинга:** {color_code_index('Gunning Fog Index', indices['gunning_fog_index'])}",
         unsafe_allow_html=True,
     )
     st.markdown(
-        f"**Индекс SMOG:** {color_code_index('SMOG Index', smog)}",
+        f"**Индекс SMOG:** {color_code_index('SMOG Index', indices['smog_index'])}",
         unsafe_allow_html=True,
     )
 
     st.markdown("---")
 
+    if result.get('sentences') and result['sentences']['text']:
+        render_sentence_difficulty(result['sentences'], result['lang'])
+        st.markdown("---")
+
     st.subheader("Оценка тональности:")
-    if sentiment_score is not None:
-        st.write(f"**Тональность:** {sentiment_label}")
-        st.write(f"**Уверенность:** {sentiment_score:.2f}")
+    if sentiment is not None:
+        st.write(f"**Тональность:** {sentiment['label']}")
+        st.write(f"**Уверенность:** {sentiment['score']:.2f}")
+        if len(sentiment['sections']) > 1:
+            with st.expander(f"Тональность по фрагментам ({len(sentiment['sections'])})"):
+                st.dataframe(sentiment['sections'], use_container_width=True)
+    elif sentiment_status == 'unsupported':
+        st.write("Тональность не поддерживается для данного языка.")
+    elif sentiment_status == 'unavailable':
+        st.write("Ошибка при загрузке модели для анализа тональности.")
     else:
-        st.write(sentiment_label)
+        st.write("Не удалось выполнить анализ тональности.")
 
     st.markdown("---")
 
+def render_sentence_difficulty(sentences, lang):
+    from utils.readability_indices import sentence_scores, hardest_sentences
+    st.subheader("Сложность предложений")
+    texts = sentences['text']
+    index_label = st.radio(
+        "Показатель", ("Индекс удобочитаемости Флеша", "Индекс тумана Ганнинга"), horizontal=True, key='difficulty_index'
+    )
+    window = st.slider("Окно сглаживания (предложений)", 1, 25, 1, key='difficulty_window')
+
+    # Only array arithmetic on rerun; tokenization happened once in the analysis job
+    with metrics.timer('sentence_scores'):
+        scores = sentence_scores(sentences['words'], sentences['syllables'], sentences['complex'], lang, window)
+    fre, fog = scores['flesch_reading_ease'], scores['gunning_fog_index']
+    if index_label == "Индекс тумана Ганнинга":
+        index_name, values, higher_is_harder = "Gunning Fog Index", fog, True
+    else:
+        index_name, values, higher_is_harder = "Flesch Reading Ease", fre, False
+
+    top_n = st.number_input("Количество самых сложных предложений", 1, 100, 10, key='difficulty_top_n')
+    hardest = hardest_sentences(values, int(top_n), higher_is_harder)
+    st.dataframe(
+        [
+            {
+                "№": int(i) + 1,
+                "Предложение": texts[i] if len(texts[i]) <= 300 else texts[i][:300] + "…",
+                "Слов": sentences['words'][i],
+                "Флеш": round(float(fre[i]), 1),
+                "Ганнинг": round(float(fog[i]), 1),
+            }
+            for i in hardest
+        ],
+        use_container_width=True,
+    )
+
+    with st.expander("Подсветка предложений"):
+        num_pages = (len(texts) + SENTENCES_PER_PAGE - 1) // SENTENCES_PER_PAGE
+        page = 1
+        if num_pages > 1:
+            page = st.number_input(f"Страница (из {num_pages})", 1, num_pages, 1, key='difficulty_page')
+        start = (int(page) - 1) * SENTENCES_PER_PAGE
+        end = start + SENTENCES_PER_PAGE
+        st.markdown(highlight_sentences(texts[start:end], values[start:end], index_name), unsafe_allow_html=True)
+
 if __name__ == "__main__":
     main()
@@ -1,9 +1,29 @@
 # models/nltk_resources.py
 
-import nltk
 import logging
+import threading
+from utils.tokenizers import DEFAULT_TOKENIZER_BACKEND
+
+_setup_lock = threading.Lock()
+_setup_result = None
 
 def setup_nltk():
+    # Runs once per process: the UI calls this on every Streamlit rerun, and
+    # an offline machine should not retry the download on each of them
+    global _setup_result
+    if _setup_result is None:
+        with _setup_lock:
+            if _setup_result is None:
+                _setup_result = _setup_nltk()
+    return _setup_result
+
+def _setup_nltk():
+    # Only the NLTK tokenizer backend needs punkt. A failed download is not
+    # fatal: with TOKENIZER_BACKEND=auto the regex backend is used instead.
+    if DEFAULT_TOKENIZER_BACKEND == 'regex':
+        return False
+
+    import nltk
     nltk_data_dir = 'nltk_data'
 
     # Add the nltk_data directory to the NLTK data path
@@ -17,6 +37,15 @@ def setup_nltk():
     try:
         nltk.data.find('tokenizers/punkt_tab')
         logging.info(f"NLTK package '{required_package}' is already installed.")
+        return True
     except LookupError:
         logging.info(f"Downloading NLTK package: {required_package}")
-        nltk.download(required_package, download_dir=nltk_data_dir, quiet=True)
+
+    try:
+        downloaded = nltk.download(required_package, download_dir=nltk_data_dir, quiet=True, raise_on_error=True)
+    except Exception as e:
+        logging.warning(f"Could not download NLTK package '{required_package}': {e}")
+        downloaded = False
+    if not downloaded and DEFAULT_TOKENIZER_BACKEND == 'auto':
+        logging.warning("NLTK punkt is unavailable; falling back to the regex tokenizer.")
+    return bool(downloaded)
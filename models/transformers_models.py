@@ -1,31 +1,67 @@
 # models/transformers_models.py
 
-from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
 import os
 import logging
+import time
 
-def load_sentiment_analyzer():
+# torch and transformers take seconds to import, so the functions below import
+# them on first use and SENTIMENT_MODEL_VERSION stays cheap to import
+LOCAL_MODEL_DIR = 'local_models/finbert-tone'
+# int8 dynamic quantization of the Linear layers, applied only when running on CPU
+QUANTIZE_ON_CPU = os.environ.get('SENTIMENT_QUANTIZE', '0') == '1'
+# Part of cache keys for sentiment results; bump when the model or scoring changes
+SENTIMENT_MODEL_VERSION = 'finbert-tone-chunked-1' + ('-int8' if QUANTIZE_ON_CPU else '')
+WARMUP_TEXT = "The company reported stable revenue growth this quarter."
+
+def select_device(workers=1):
+    # Pipeline device index: 0 for the first GPU, -1 for CPU. Applies the
+    # runtime config (device, torch threads for one of `workers` processes)
+    # unless the process already did.
+    from utils.runtime_config import configure_torch
+    return 0 if configure_torch(workers)['device'] == 'cuda' else -1
+
+def quantize_model(model):
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_sentiment_analyzer(device=None, quantize=None, warmup=True, workers=1):
     try:
-        local_model_dir = 'local_models/finbert-tone'
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+        local_model_dir = LOCAL_MODEL_DIR
 
         # Check if the local model directory exists
         if not os.path.exists(local_model_dir):
             logging.error(f"Local FinBERT model not found at '{local_model_dir}'.")
             return None
 
+        device = select_device(workers) if device is None else device
+        quantize = QUANTIZE_ON_CPU if quantize is None else quantize
+
         # Load the model and tokenizer from the local directory
         model = AutoModelForSequenceClassification.from_pretrained(local_model_dir)
         tokenizer = AutoTokenizer.from_pretrained(local_model_dir)
+        model.eval()
+        if quantize and device == -1:
+            model = quantize_model(model)
 
         # Initialize the pipeline with the local model and tokenizer
         sentiment_analyzer = pipeline(
             "sentiment-analysis",
             model=model,
             tokenizer=tokenizer,
-            device=0  # Set to -1 for CPU or 0 for GPU
+            device=device
         )
 
-        logging.debug("Sentiment analyzer loaded successfully using the local FinBERT model.")
+        if warmup:
+            # The first call pays for lazy initialization (kernels, allocator); do it now
+            start = time.perf_counter()
+            sentiment_analyzer(WARMUP_TEXT)
+            logging.debug(f"Sentiment analyzer warmed up in {time.perf_counter() - start:.2f}s.")
+
+        logging.debug(
+            f"Sentiment analyzer loaded successfully using the local FinBERT model "
+            f"(device={'cuda:0' if device == 0 else device}, int8={bool(quantize and device == -1)})."
+        )
 
         return sentiment_analyzer
 
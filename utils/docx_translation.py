@@ -0,0 +1,106 @@
+# utils/docx_translation.py
+#
+# DOCX-to-DOCX translation that keeps the document's structure: body
+# paragraphs, table cells (including nested tables), headers and footers are
+# translated in place, so styles, lists, tables and page setup survive.
+# Every unique segment is translated once, however often it repeats across
+# cells, pages and footers.
+#
+# Segments are paragraphs, split further at tabs and line breaks. The
+# translated paragraph goes into its first run and takes that run's character
+# formatting; formatting that changes inside a paragraph is not carried over.
+
+import io
+import re
+from .file_readers import load_docx
+from .translation_pipeline import translate_documents
+from . import metrics
+
+# Tabs and line breaks separate segments; segments without letters
+# (numbers, dates, codes) are left as they are
+_PIECE = re.compile(r'[^\t\n]+')
+_HAS_LETTERS = re.compile(r'[^\W\d_]')
+
+def _iter_table_paragraphs(table):
+    # Horizontally merged cells appear once per grid column; visit each only once
+    seen = {}
+    for row in table.rows:
+        for cell in row.cells:
+            if id(cell._tc) in seen:
+                continue
+            seen[id(cell._tc)] = cell._tc
+            yield from cell.paragraphs
+            for nested in cell.tables:
+                yield from _iter_table_paragraphs(nested)
+
+def _iter_block_paragraphs(container):
+    yield from container.paragraphs
+    for table in container.tables:
+        yield from _iter_table_paragraphs(table)
+
+def iter_docx_paragraphs(doc):
+    yield from _iter_block_paragraphs(doc)
+    for section in doc.sections:
+        for part in (
+            section.header, section.first_page_header, section.even_page_header,
+            section.footer, section.first_page_footer, section.even_page_footer,
+        ):
+            # A linked part belongs to an earlier section; touching its
+            # paragraphs would also add an empty definition to this one
+            if not part.is_linked_to_previous:
+                yield from _iter_block_paragraphs(part)
+
+def _paragraph_text(paragraph):
+    # Text of the runs we can write back to; hyperlink and field text is left alone
+    return ''.join(run.text for run in paragraph.runs)
+
+def _segments(text):
+    # Translatable segments of a paragraph: tab- and line-separated pieces
+    # with letters, without surrounding whitespace
+    return [piece.strip() for piece in _PIECE.findall(text) if _HAS_LETTERS.search(piece)]
+
+def _substitute(text, translated):
+    # Puts each segment's translation in its place, keeping tabs, line breaks
+    # and surrounding whitespace
+    def replace(match):
+        piece = match.group()
+        segment = piece.strip()
+        if segment not in translated:
+            return piece
+        start = piece.index(segment)
+        return piece[:start] + translated[segment] + piece[start + len(segment):]
+    return _PIECE.sub(replace, text)
+
+def collect_segments(doc):
+    # [(paragraph, text)] for every paragraph with something to translate
+    collected = []
+    for paragraph in iter_docx_paragraphs(doc):
+        text = _paragraph_text(paragraph)
+        if _segments(text):
+            collected.append((paragraph, text))
+    return collected
+
+def _write_paragraph(paragraph, text):
+    runs = paragraph.runs
+    runs[0].text = text
+    for run in runs[1:]:
+        run.text = ''
+
+def translate_docx(source, src_lang, tgt_lang, translation, workers=None, progress=None):
+    # Returns (translated .docx bytes, {'segments', 'unique_segments'}).
+    # source: anything utils.file_readers accepts.
+    doc = load_docx(source)
+    paragraphs = collect_segments(doc)
+    segments = [segment for _, text in paragraphs for segment in _segments(text)]
+    unique = list(dict.fromkeys(segments))
+    metrics.count('segments', len(segments), stage='docx_translation')
+    metrics.count('unique_segments', len(unique), stage='docx_translation')
+
+    with metrics.timer('docx_translation'):
+        translated = dict(zip(unique, translate_documents(unique, src_lang, tgt_lang, translation, workers, progress=progress)))
+    for paragraph, text in paragraphs:
+        _write_paragraph(paragraph, _substitute(text, translated))
+
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue(), {'segments': len(segments), 'unique_segments': len(unique)}
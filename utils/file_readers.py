@@ -1,35 +1,164 @@
 # utils/file_readers.py
+#
+# Every reader accepts a file path, an in-memory buffer (bytes, bytearray,
+# memoryview) or a binary file-like object such as a Streamlit UploadedFile.
+# The format is detected from the leading bytes, not from the file name.
 
-import docx
-import PyPDF2
+import io
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import streamlit as st
+from . import metrics
+from .tokenizers import join_soft_line_breaks
 
-def read_txt(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return f.read()
+# PDFs with at least this many selected pages are extracted on a process pool
+PARALLEL_PDF_MIN_PAGES = int(os.environ.get('PARALLEL_PDF_MIN_PAGES', 200))
+PDF_PAGES_PER_TASK = 50
+DEFAULT_PDF_WORKERS = int(os.environ.get('PDF_WORKERS', os.cpu_count() or 1))
 
-def read_docx(file_path):
-    doc = docx.Document(file_path)
+PDF_MAGIC = b'%PDF-'
+# .docx is a ZIP container
+ZIP_MAGIC = b'PK\x03\x04'
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+def _as_buffer(source):
+    # memoryview over the source's bytes; file-like objects with getbuffer() are not copied
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).cast('B')
+    getbuffer = getattr(source, 'getbuffer', None)
+    if getbuffer is not None:
+        return getbuffer()
+    source.seek(0)
+    return memoryview(source.read())
+
+def _open_binary(source):
+    # Seekable binary stream for the docx/PDF parsers
+    if _is_path(source):
+        return open(source, 'rb')
+    if hasattr(source, 'read'):
+        source.seek(0)
+        return source
+    return io.BytesIO(source)
+
+def detect_format(source):
+    if _is_path(source):
+        with open(source, 'rb') as f:
+            head = f.read(len(PDF_MAGIC))
+    else:
+        head = bytes(_as_buffer(source)[:len(PDF_MAGIC)])
+    if head.startswith(PDF_MAGIC):
+        return 'pdf'
+    if head.startswith(ZIP_MAGIC):
+        return 'docx'
+    return 'txt'
+
+def read_txt(source):
+    if _is_path(source):
+        with open(source, 'r', encoding='utf-8-sig') as f:
+            return f.read()
+    # Decodes straight from the buffer, without an intermediate bytes copy
+    return str(_as_buffer(source), 'utf-8-sig')
+
+def load_docx(source):
+    # docx.Document for any source; a file opened here is closed once the
+    # document is parsed, since python-docx keeps everything in memory
+    import docx
+    if _is_path(source):
+        with open(source, 'rb') as f:
+            return docx.Document(f)
+    return docx.Document(_open_binary(source))
+
+def read_docx(source):
+    doc = load_docx(source)
     full_text = [para.text for para in doc.paragraphs]
     return '\n'.join(full_text)
 
-def read_pdf(file_path):
-    text = ''
-    with open(file_path, 'rb') as f:
+def _select_pages(num_pages, pages):
+    # pages: None for all, or an iterable of 0-based page indices (e.g. range(10, 20))
+    if pages is None:
+        return range(num_pages)
+    return [i for i in pages if 0 <= i < num_pages]
+
+def _page_texts(reader, page_indices):
+    for i in page_indices:
+        page_text = reader.pages[i].extract_text()
+        if page_text:
+            yield page_text
+
+def iter_pdf_pages(source, pages=None):
+    # Yields the text of each selected page, one page in memory at a time
+    import PyPDF2
+    f = _open_binary(source)
+    try:
+        reader = PyPDF2.PdfReader(f)
+        yield from _page_texts(reader, _select_pages(len(reader.pages), pages))
+    finally:
+        if _is_path(source):
+            f.close()
+
+def _extract_pages(file_path, page_indices):
+    return '\n'.join(iter_pdf_pages(file_path, page_indices))
+
+def read_pdf(source, pages=None, workers=None):
+    # Pages are joined with a line break, then the soft line breaks of the
+    # visual layout are joined, so sentences that cross lines or pages stay whole
+    return join_soft_line_breaks(_read_pdf_pages(source, pages, workers))
+
+def _read_pdf_pages(source, pages, workers):
+    import PyPDF2
+    workers = DEFAULT_PDF_WORKERS if workers is None else workers
+    f = _open_binary(source)
+    try:
         reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text
+        selected = list(_select_pages(len(reader.pages), pages))
+        if workers <= 1 or len(selected) < PARALLEL_PDF_MIN_PAGES:
+            return '\n'.join(_page_texts(reader, selected))
+    finally:
+        if _is_path(source):
+            f.close()
+
+    if _is_path(source):
+        return _extract_pages_in_pool(source, selected, workers)
+    # Large in-memory documents (Streamlit uploads) are written to a temporary
+    # file once, so each worker opens it itself instead of receiving a copy
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+        tmp.write(_as_buffer(source))
+    try:
+        return _extract_pages_in_pool(tmp.name, selected, workers)
+    finally:
+        os.remove(tmp.name)
+
+def _extract_pages_in_pool(file_path, selected, workers):
+    # Each task opens the file itself and extracts a run of pages; results come
+    # back in page order and are joined once
+    batches = [selected[i:i + PDF_PAGES_PER_TASK] for i in range(0, len(selected), PDF_PAGES_PER_TASK)]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(batches)),
+        mp_context=multiprocessing.get_context('spawn'),
+    ) as pool:
+        return '\n'.join(pool.map(_extract_pages, [file_path] * len(batches), batches))
+
+def extract_text(source):
+    # Like read_file, but errors (e.g. UnicodeDecodeError) propagate; for
+    # callers outside Streamlit such as batch_process.py
+    file_format = detect_format(source)
+    with metrics.timer('read_file', format=file_format):
+        if file_format == 'pdf':
+            text = read_pdf(source)
+        elif file_format == 'docx':
+            text = read_docx(source)
+        else:
+            text = read_txt(source)
+    metrics.count('characters', len(text), stage='read_file')
     return text
 
-def read_file(file_path):
-    if file_path.endswith('.txt'):
-        return read_txt(file_path)
-    elif file_path.endswith('.docx'):
-        return read_docx(file_path)
-    elif file_path.endswith('.pdf'):
-        return read_pdf(file_path)
-    else:
+def read_file(source):
+    try:
+        return extract_text(source)
+    except UnicodeDecodeError:
         st.error('Unsupported file format.')
         return ""
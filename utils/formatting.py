@@ -1,6 +1,17 @@
 # utils/formatting.py
 
-def color_code_index(index_name, value):
+import html
+
+# Translucent versions of the index colours, for sentence backgrounds
+HIGHLIGHT_COLORS = {
+    'green': 'rgba(0, 128, 0, 0.15)',
+    'lightgreen': 'rgba(144, 238, 144, 0.35)',
+    'orange': 'rgba(255, 165, 0, 0.35)',
+    'red': 'rgba(255, 0, 0, 0.3)',
+    'black': 'transparent',
+}
+
+def index_color(index_name, value):
     if index_name == "Flesch Reading Ease":
         if value >= 90:
             color = "green"
@@ -13,21 +24,37 @@ def color_code_index(index_name, value):
     elif index_name == "Flesch-Kincaid Grade Level":
         if value <= 5:
             color = "green"
-        elif 6 <= value <= 10:
+        elif value <= 10:
             color = "lightgreen"
-        elif 11 <= value <= 15:
+        elif value <= 15:
             color = "orange"
         else:
             color = "red"
     elif index_name in ["Gunning Fog Index", "SMOG Index"]:
         if value <= 6:
             color = "green"
-        elif 7 <= value <= 12:
+        elif value <= 12:
             color = "lightgreen"
-        elif 13 <= value <= 17:
+        elif value <= 17:
             color = "orange"
         else:
             color = "red"
     else:
         color = "black"
-    return f"<span style='color: {color};'>{value:.2f}</span>"
+    return color
+
+def color_code_index(index_name, value):
+    return f"<span style='color: {index_color(index_name, value)};'>{value:.2f}</span>"
+
+def highlight_sentences(sentences, scores, index_name):
+    # Sentences as inline spans shaded by their score, with the score on hover
+    spans = []
+    for sentence, score in zip(sentences, scores):
+        if score != score:  # NaN: no words to score
+            spans.append(html.escape(sentence))
+            continue
+        background = HIGHLIGHT_COLORS[index_color(index_name, score)]
+        spans.append(
+            f"<span title='{score:.1f}' style='background-color: {background};'>{html.escape(sentence)}</span>"
+        )
+    return "<div style='line-height: 1.8;'>" + ' '.join(spans) + "</div>"
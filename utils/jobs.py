@@ -0,0 +1,462 @@
+# utils/jobs.py
+#
+# Local background jobs for translation and analysis: a SQLite job table as
+# the broker and one spawn-based process pool per model, so long work runs
+# outside the Streamlit script thread and concurrency is capped per model.
+# The UI submits a job, keeps its ID and polls for progress and output.
+
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', 'cache/jobs.sqlite3')
+# Worker processes per model; each job kind runs on its model's pool
+MODEL_CONCURRENCY = {
+    'argos': int(os.environ.get('JOB_WORKERS_ARGOS', 2)),
+    'finbert': int(os.environ.get('JOB_WORKERS_FINBERT', 1)),
+}
+JOB_MODELS = {
+    'translation': 'argos',
+    'docx_translation': 'argos',
+    'analysis': 'finbert',
+    'warmup_argos': 'argos',
+    'warmup_finbert': 'finbert',
+}
+# Progress and output are flushed to the job table at most this often
+FLUSH_INTERVAL = 0.5
+# Finished jobs, their output and their files (uploaded and translated
+# documents) are deleted after this long; checked at most once per PURGE_INTERVAL
+JOB_RETENTION_SECONDS = float(os.environ.get('JOB_RETENTION_HOURS', 7 * 24)) * 3600
+PURGE_INTERVAL = 3600
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    pass
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
+def _init_db(db_path):
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = _connect(db_path)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS jobs ('
+        ' id TEXT PRIMARY KEY,'
+        ' kind TEXT NOT NULL,'
+        ' status TEXT NOT NULL,'
+        ' progress REAL NOT NULL DEFAULT 0,'
+        ' payload TEXT NOT NULL,'
+        ' result TEXT,'
+        ' error TEXT,'
+        ' cancel_requested INTEGER NOT NULL DEFAULT 0,'
+        ' created_at REAL NOT NULL,'
+        ' updated_at REAL NOT NULL)'
+    )
+    # Incremental output (e.g. translated paragraphs) that the UI can render before the job ends
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS job_output ('
+        ' job_id TEXT NOT NULL,'
+        ' seq INTEGER NOT NULL,'
+        ' data TEXT NOT NULL,'
+        ' PRIMARY KEY (job_id, seq))'
+    )
+    conn.commit()
+    return conn
+
+class JobContext:
+    # Handed to job handlers in the worker process
+    def __init__(self, conn, job_id):
+        self._conn = conn
+        self.job_id = job_id
+        self._progress = 0.0
+        self._pending_output = []
+        self._next_seq = 0
+        self._last_flush = 0.0
+
+    def emit(self, data):
+        self._pending_output.append(data)
+        self._maybe_flush()
+
+    def progress(self, fraction):
+        self._progress = fraction
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        rows = [
+            (self.job_id, self._next_seq + i, json.dumps(data, ensure_ascii=False))
+            for i, data in enumerate(self._pending_output)
+        ]
+        self._next_seq += len(rows)
+        self._pending_output = []
+        self._conn.executemany('INSERT INTO job_output (job_id, seq, data) VALUES (?, ?, ?)', rows)
+        self._conn.execute(
+            'UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?', (self._progress, time.time(), self.job_id)
+        )
+        self._conn.commit()
+        self._last_flush = time.monotonic()
+        cancel_requested = self._conn.execute(
+            'SELECT cancel_requested FROM jobs WHERE id = ?', (self.job_id,)
+        ).fetchone()[0]
+        if cancel_requested:
+            raise JobCancelled()
+
+# Per-worker-process state for the handlers
+_worker_sentiment_analyzer = None
+_worker_pool_size = 1
+
+def _init_worker(model, workers):
+    global _worker_pool_size
+    logging.basicConfig(level=logging.INFO)
+    from models.nltk_resources import setup_nltk
+    from .runtime_config import configure_translation
+    setup_nltk()
+    _worker_pool_size = workers
+    # torch is configured when FinBERT is loaded, so its import stays deferred
+    if model == 'argos':
+        configure_translation(workers)
+
+def _worker_analyzer():
+    # FinBERT is loaded by the first job that needs it, then kept for the process
+    global _worker_sentiment_analyzer
+    if _worker_sentiment_analyzer is None:
+        from models.transformers_models import load_sentiment_analyzer
+        # Returns None (sentiment 'unavailable') on any torch or model error
+        _worker_sentiment_analyzer = load_sentiment_analyzer(workers=_worker_pool_size)
+    return _worker_sentiment_analyzer
+
+def _warmup_argos_job(ctx, payload):
+    from .translator_registry import get_translation
+    return {'loaded': [f"{src}-{tgt}" for src, tgt in payload['pairs'] if get_translation(src, tgt) is not None]}
+
+def _warmup_finbert_job(ctx, payload):
+    return {'loaded': _worker_analyzer() is not None}
+
+def _translation_job(ctx, payload):
+    from .translator_registry import get_translation
+    from .translation_pipeline import count_paragraphs, iter_translate_document
+
+    text, src_lang, tgt_lang = payload['text'], payload['src_lang'], payload['tgt_lang']
+    translation = get_translation(src_lang, tgt_lang)
+    if translation is None:
+        raise RuntimeError(f"No translation model found for '{src_lang}' to '{tgt_lang}'.")
+    total = count_paragraphs(text)
+    done = 0
+    for paragraph in iter_translate_document(text, src_lang, tgt_lang, translation, workers=payload.get('workers', 1)):
+        done += 1
+        ctx.emit(paragraph)
+        ctx.progress(done / total)
+    return {'paragraphs': done}
+
+def _docx_translation_job(ctx, payload):
+    # Payloads are JSON, so the documents travel as files in the job file directory
+    from .translator_registry import get_translation
+    from .docx_translation import translate_docx
+
+    src_lang, tgt_lang = payload['src_lang'], payload['tgt_lang']
+    translation = get_translation(src_lang, tgt_lang)
+    if translation is None:
+        raise RuntimeError(f"No translation model found for '{src_lang}' to '{tgt_lang}'.")
+    data, counts = translate_docx(
+        payload['input_path'], src_lang, tgt_lang, translation, workers=payload.get('workers', 1),
+        progress=lambda done, total: ctx.progress(done / total),
+    )
+    with open(payload['output_path'], 'wb') as f:
+        f.write(data)
+    return dict(counts, output_path=payload['output_path'])
+
+def _analysis_job(ctx, payload):
+    from .readability_indices import compute_indices
+    from .sentiment import analyze_sentiment_incremental
+    from .text_stats import compute_document_stats
+
+    # Paragraph results are cached in this worker process (and on disk when
+    # RESULT_CACHE_DIR is set), so re-analysing an edited text is incremental
+    text, lang = payload['text'], payload['lang']
+    stats = compute_document_stats(text, lang)
+    indices = compute_indices(stats, lang)
+    # Per-sentence counts as plain lists; the UI scores them with NumPy
+    words, syllables, complex_words = stats.sentence_arrays()
+    sentences = {
+        'text': stats.sentences,
+        'words': words.tolist(),
+        'syllables': syllables.tolist(),
+        'complex': complex_words.tolist(),
+    }
+    ctx.progress(0.3)
+    ctx.flush()
+
+    sentiment = None
+    sentiment_status = 'unsupported'
+    if lang in ('ru', 'en'):
+        analyzer = _worker_analyzer()
+        if analyzer is None:
+            sentiment_status = 'unavailable'
+        else:
+            try:
+                from models.transformers_models import SENTIMENT_MODEL_VERSION
+                sentiment = analyze_sentiment_incremental(text, analyzer, lang, SENTIMENT_MODEL_VERSION)
+                sentiment_status = 'ok'
+            except Exception as e:
+                logging.exception(f"Sentiment analysis failed: {e}")
+                sentiment_status = 'failed'
+    ctx.progress(1.0)
+    return {'lang': lang, 'indices': indices, 'sentences': sentences, 'sentiment': sentiment, 'sentiment_status': sentiment_status}
+
+JOB_HANDLERS = {
+    'translation': _translation_job,
+    'docx_translation': _docx_translation_job,
+    'analysis': _analysis_job,
+    'warmup_argos': _warmup_argos_job,
+    'warmup_finbert': _warmup_finbert_job,
+}
+
+def _run_job(db_path, job_id, kind, payload):
+    conn = _connect(db_path)
+    try:
+        row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None or row[0]:
+            conn.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?', (CANCELLED, time.time(), job_id))
+            conn.commit()
+            return
+        conn.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?', (RUNNING, time.time(), job_id))
+        conn.commit()
+
+        ctx = JobContext(conn, job_id)
+        try:
+            result = JOB_HANDLERS[kind](ctx, payload)
+            ctx.flush()
+        except JobCancelled:
+            conn.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?', (CANCELLED, time.time(), job_id))
+        except Exception as e:
+            logging.exception(f"Job {job_id} ({kind}) failed")
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+                (FAILED, f"{type(e).__name__}: {e}", time.time(), job_id),
+            )
+        else:
+            conn.execute(
+                'UPDATE jobs SET status = ?, progress = 1, result = ?, updated_at = ? WHERE id = ?',
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), job_id),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+class JobManager:
+    def __init__(self, db_path=DEFAULT_JOBS_DB_PATH, concurrency=None):
+        self.db_path = db_path
+        self.concurrency = dict(MODEL_CONCURRENCY, **(concurrency or {}))
+        self._conn = _init_db(db_path)
+        # Input and output documents of file-based jobs
+        self.files_dir = os.path.join(os.path.dirname(db_path) or '.', 'job_files')
+        os.makedirs(self.files_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._futures = {}
+        self._last_purge = 0.0
+        # Jobs left queued or running by a previous server process will never finish
+        self._conn.execute(
+            'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)',
+            (FAILED, 'Interrupted by a server restart.', time.time(), QUEUED, RUNNING),
+        )
+        self._conn.commit()
+
+    def _pool(self, model):
+        pool = self._pools.get(model)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=self.concurrency[model],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(model, self.concurrency[model]),
+            )
+            self._pools[model] = pool
+        return pool
+
+    def _discard_pool(self, model, pool):
+        # A pool whose worker died is broken for good; the next submit builds a new one
+        if self._pools.get(model) is pool:
+            del self._pools[model]
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_to_pool(self, model, job_id, kind, payload):
+        pool = self._pool(model)
+        try:
+            return pool, pool.submit(_run_job, self.db_path, job_id, kind, payload)
+        except BrokenProcessPool:
+            logging.warning(f"Process pool for '{model}' is broken; starting a new one.")
+            self._discard_pool(model, pool)
+            pool = self._pool(model)
+            return pool, pool.submit(_run_job, self.db_path, job_id, kind, payload)
+
+    def _job_done(self, job_id, model, pool, future):
+        # The worker records how a job ended; this covers jobs whose worker
+        # never got to, because the process died (OOM, segfault) or never started
+        self._futures.pop(job_id, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            return
+        if isinstance(error, BrokenProcessPool):
+            message = f"The worker process running the job died ({type(error).__name__}: {error})."
+            with self._lock:
+                self._discard_pool(model, pool)
+        else:
+            message = f"{type(error).__name__}: {error}"
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)',
+                (FAILED, message, time.time(), job_id, QUEUED, RUNNING),
+            )
+            self._conn.commit()
+
+    def submit(self, kind, payload):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        self._maybe_purge()
+        job_id = uuid.uuid4().hex
+        model = JOB_MODELS[kind]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, QUEUED, json.dumps(payload, ensure_ascii=False), now, now),
+            )
+            self._conn.commit()
+            try:
+                pool, future = self._submit_to_pool(model, job_id, kind, payload)
+            except Exception:
+                # Nothing will ever run the job; do not leave it queued
+                self._conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+                self._conn.commit()
+                raise
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._job_done(job_id, model, pool, f))
+        return job_id
+
+    def prewarm(self, pairs=(('ru', 'en'), ('en', 'ru'))):
+        # One warm-up job per worker slot, so the pools start their processes
+        # and load their models before the first real job arrives
+        job_ids = []
+        for _ in range(self.concurrency['argos']):
+            job_ids.append(self.submit('warmup_argos', {'pairs': [list(pair) for pair in pairs]}))
+        for _ in range(self.concurrency['finbert']):
+            job_ids.append(self.submit('warmup_finbert', {}))
+        return job_ids
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT kind, status, progress, result, error, created_at, updated_at FROM jobs WHERE id = ?',
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        kind, status, progress, result, error, created_at, updated_at = row
+        return {
+            'id': job_id,
+            'kind': kind,
+            'status': status,
+            'progress': progress,
+            'result': json.loads(result) if result else None,
+            'error': error,
+            'created_at': created_at,
+            'updated_at': updated_at,
+        }
+
+    def output(self, job_id, start=0):
+        # Incremental output items with seq >= start, in order
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data FROM job_output WHERE job_id = ? AND seq >= ? ORDER BY seq', (job_id, start)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def cancel(self, job_id):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?', (time.time(), job_id)
+            )
+            self._conn.commit()
+            future = self._futures.get(job_id)
+            # A job still waiting in the pool queue can be dropped outright
+            if future is not None and future.cancel():
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?', (CANCELLED, time.time(), job_id)
+                )
+                self._conn.commit()
+
+    def job_file(self, name):
+        return os.path.join(self.files_dir, name)
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        try:
+            self.purge()
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Could not purge old jobs: {e}")
+
+    def purge(self, older_than=JOB_RETENTION_SECONDS):
+        cutoff = time.time() - older_than
+        with self._lock:
+            # Files of jobs that are still queued or running are kept, however old
+            in_use = set()
+            rows = self._conn.execute(
+                'SELECT payload FROM jobs WHERE status IN (?, ?)', (QUEUED, RUNNING)
+            ).fetchall()
+        for (payload,) in rows:
+            payload = json.loads(payload)
+            in_use.update(os.path.abspath(payload[k]) for k in ('input_path', 'output_path') if k in payload)
+        for entry in os.scandir(self.files_dir):
+            if entry.stat().st_mtime < cutoff and os.path.abspath(entry.path) not in in_use:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            placeholders = ','.join('?' * len(FINISHED_STATUSES))
+            self._conn.execute(
+                f'DELETE FROM job_output WHERE job_id IN (SELECT id FROM jobs WHERE updated_at < ? AND status IN ({placeholders}))',
+                (cutoff, *FINISHED_STATUSES),
+            )
+            self._conn.execute(
+                f'DELETE FROM jobs WHERE updated_at < ? AND status IN ({placeholders})', (cutoff, *FINISHED_STATUSES)
+            )
+            self._conn.commit()
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager():
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = JobManager()
+                # Once at startup, then from submit() at most once per PURGE_INTERVAL
+                _job_manager._maybe_purge()
+    return _job_manager
@@ -0,0 +1,169 @@
+# utils/metrics.py
+#
+# Lightweight stage timing and counters. Disabled unless METRICS_ENABLED=1;
+# when disabled, timer() hands back a shared no-op context manager and
+# count() returns immediately, so instrumented code pays a flag check.
+# Metrics are per process and can be rendered in Prometheus text format,
+# dumped to a file (METRICS_DUMP_PATH, written at exit) or shown in the UI.
+
+import atexit
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+_enabled = os.environ.get('METRICS_ENABLED', '0') == '1'
+_lock = threading.Lock()
+_timers = {}    # (name, labels) -> [count, total_seconds, max_seconds]
+_counters = {}  # (name, labels) -> value
+_gauges = {}    # name -> callable returning {labels_tuple: value}
+_NOOP = nullcontext()
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+class _Timer:
+    __slots__ = ('key', 'start')
+
+    def __init__(self, key):
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            stats = _timers.get(self.key)
+            if stats is None:
+                _timers[self.key] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+        return False
+
+def timer(stage, **labels):
+    # with timer('translation', lang='ru'): ...
+    if not _enabled:
+        return _NOOP
+    return _Timer((stage, _labels(labels)))
+
+def timed(stage, **labels):
+    def decorator(func):
+        key = (stage, _labels(labels))
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(key):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(name, value=1, **labels):
+    # Counters for volume processed, e.g. count('characters', len(text), stage='read')
+    if not _enabled:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def register_gauge(name, func):
+    # func() -> {labels_dict_as_tuple: value}; evaluated only when metrics are rendered
+    _gauges[name] = func
+
+def register_hit_rate(cache_name, stats_func):
+    # stats_func() returns a dict with 'hits' and 'misses' (and optionally 'disk_hits')
+    def hit_rate():
+        stats = stats_func()
+        hits = stats.get('hits', 0) + stats.get('disk_hits', 0)
+        lookups = hits + stats.get('misses', 0)
+        return {(('cache', cache_name),): hits / lookups if lookups else 0.0}
+    _gauges[f'cache_hit_rate:{cache_name}'] = hit_rate
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+def snapshot():
+    with _lock:
+        timers = [
+            {'stage': name, **dict(labels), 'count': c, 'total_s': total, 'mean_s': total / c, 'max_s': peak}
+            for (name, labels), (c, total, peak) in sorted(_timers.items())
+        ]
+        counters = [
+            {'counter': name, **dict(labels), 'value': value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+    gauges = []
+    for name, func in sorted(_gauges.items()):
+        try:
+            values = func()
+        except Exception:
+            continue
+        for labels, value in values.items():
+            gauges.append({'gauge': name.split(':')[0], **dict(labels), 'value': value})
+    return {'timers': timers, 'counters': counters, 'gauges': gauges}
+
+def render_prometheus():
+    lines = []
+    with _lock:
+        timers = sorted(_timers.items())
+        counters = sorted(_counters.items())
+    if timers:
+        lines.append('# TYPE stage_seconds summary')
+        for (name, labels), (c, total, _) in timers:
+            label_text = _format_labels((('stage', name),) + labels)
+            lines.append(f'stage_seconds_count{label_text} {c}')
+            lines.append(f'stage_seconds_sum{label_text} {total:.6f}')
+        lines.append('# TYPE stage_seconds_max gauge')
+        for (name, labels), (_, _, peak) in timers:
+            lines.append(f'stage_seconds_max{_format_labels((("stage", name),) + labels)} {peak:.6f}')
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            lines.append(f'# TYPE {name}_total counter')
+            seen.add(name)
+        lines.append(f'{name}_total{_format_labels(labels)} {value}')
+    for gauge in snapshot()['gauges']:
+        name = gauge.pop('gauge')
+        value = gauge.pop('value')
+        if name not in seen:
+            lines.append(f'# TYPE {name} gauge')
+            seen.add(name)
+        lines.append(f'{name}{_format_labels(tuple(sorted(gauge.items())))} {value:.6f}')
+    return '\n'.join(lines) + '\n'
+
+def dump(path):
+    path = path.format(pid=os.getpid())
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus())
+
+def _dump_at_exit():
+    path = os.environ.get('METRICS_DUMP_PATH')
+    if _enabled and path:
+        dump(path)
+
+atexit.register(_dump_at_exit)
@@ -0,0 +1,107 @@
+# utils/micro_batcher.py
+#
+# Coalesces concurrent asyncio requests into batches before they reach a
+# model. A batch is dispatched when it reaches max_batch_size or when the
+# oldest request has waited max_wait_ms. The queue is bounded: when it is
+# full, submit() raises QueueFull immediately so callers can shed load.
+
+import asyncio
+import logging
+import time
+from collections import deque
+from statistics import quantiles
+
+class QueueFull(Exception):
+    pass
+
+def latency_percentiles(samples):
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {'p50': value, 'p99': value}
+    cuts = quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p99': cuts[98]}
+
+class MicroBatcher:
+    def __init__(self, name, process_batch, max_batch_size=16, max_wait_ms=10, max_queue=256, executor=None):
+        # process_batch(items) -> list of results, one per item; runs in the executor
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._task = None
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self._batch_sizes = deque(maxlen=1000)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # Nothing will serve the requests still queued
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull(f"{self.name} queue is full")
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose clients went away are not worth computing
+            batch = [(item, future) for item, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            self._batch_sizes.append(len(batch))
+            try:
+                results = await loop.run_in_executor(self.executor, self.process_batch, [item for item, _ in batch])
+            except Exception as e:
+                logging.exception(f"{self.name} batch of {len(batch)} failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        sizes = list(self._batch_sizes)
+        return {
+            'queued': self._queue.qsize(),
+            'batches': self.batches,
+            'items': self.items,
+            'rejected': self.rejected,
+            'mean_batch_size': sum(sizes) / len(sizes) if sizes else 0.0,
+        }
@@ -0,0 +1,48 @@
+# utils/prewarm.py
+#
+# Optional background warm-up for the Streamlit app (APP_PREWARM=1). After
+# the first page has rendered, a daemon thread imports the modules the app
+# defers, prepares the tokenizer and starts the job worker processes with
+# their models loaded, so the first translation or analysis does not pay for
+# any of it. Off by default: it spends memory on models that may never be used.
+
+import logging
+import os
+import threading
+import time
+
+PREWARM_ENABLED = os.environ.get('APP_PREWARM', '0') == '1'
+
+_started = False
+_started_lock = threading.Lock()
+
+def _prewarm():
+    start = time.perf_counter()
+    try:
+        import docx  # noqa: F401
+        import PyPDF2  # noqa: F401
+        import numpy  # noqa: F401
+        from models.nltk_resources import setup_nltk
+        from .tokenizers import get_tokenizer
+        from .text_processing import detect_language
+        from .jobs import get_job_manager
+
+        setup_nltk()
+        get_tokenizer()
+        # Loads langdetect's language profiles
+        detect_language("Warm-up text for the language detector.")
+        get_job_manager().prewarm()
+    except Exception as e:
+        logging.warning(f"Prewarm failed: {e}")
+        return
+    logging.info(f"Prewarm done in {time.perf_counter() - start:.2f}s; models are loading in the job workers.")
+
+def start_prewarm():
+    # Once per process; Streamlit reruns call this on every interaction
+    global _started
+    with _started_lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=_prewarm, name='prewarm', daemon=True).start()
+    return True
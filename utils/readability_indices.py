@@ -1,34 +1,43 @@
 # utils/readability_indices.py
 
-from nltk.tokenize import sent_tokenize, word_tokenize
-from .text_processing import count_syllables
+import numpy as np
+from .text_stats import TextStats, compute_text_stats
 
-def flesch_reading_ease(text, lang):
-    sentences = sent_tokenize(text, language='russian' if lang == 'ru' else 'english')
-    words = [word for word in word_tokenize(text, language='russian' if lang == 'ru' else 'english') if word.isalpha()]
-    num_sentences = max(1, len(sentences))
-    num_words = max(1, len(words))
-    syllable_count = sum([count_syllables(word, lang) for word in words])
+# Flesch Reading Ease: base - asl_weight * ASL - asw_weight * ASW
+FRE_COEFFICIENTS = {
+    'ru': (206.835, 1.3, 60.1),
+    'en': (206.835, 1.015, 84.6),
+    'kk': (206.835, 1.2, 70),
+}
+
+# Every index accepts either raw text (tokenized on the spot) or a precomputed
+# TextStats, so callers that need several indices tokenize the text only once.
+def _as_stats(text, lang):
+    if isinstance(text, TextStats):
+        return text
+    return compute_text_stats(text, lang)
+
+def flesch_reading_ease(text, lang=None):
+    stats = _as_stats(text, lang)
+    lang = stats.lang
+    num_sentences = max(1, stats.num_sentences)
+    num_words = max(1, stats.num_words)
     asl = num_words / num_sentences
-    asw = syllable_count / num_words
-    if lang == 'ru':
-        fre = 206.835 - (1.3 * asl) - (60.1 * asw)
-    elif lang == 'en':
-        fre = 206.835 - (1.015 * asl) - (84.6 * asw)
-    elif lang == 'kk':
-        fre = 206.835 - (1.2 * asl) - (70 * asw)
+    asw = stats.num_syllables / num_words
+    if lang in FRE_COEFFICIENTS:
+        base, asl_weight, asw_weight = FRE_COEFFICIENTS[lang]
+        fre = base - (asl_weight * asl) - (asw_weight * asw)
     else:
         fre = 0
     return fre
 
-def flesch_kincaid_grade_level(text, lang):
-    sentences = sent_tokenize(text, language='russian' if lang == 'ru' else 'english')
-    words = [word for word in word_tokenize(text, language='russian' if lang == 'ru' else 'english') if word.isalpha()]
-    num_sentences = max(1, len(sentences))
-    num_words = max(1, len(words))
-    syllable_count = sum([count_syllables(word, lang) for word in words])
+def flesch_kincaid_grade_level(text, lang=None):
+    stats = _as_stats(text, lang)
+    lang = stats.lang
+    num_sentences = max(1, stats.num_sentences)
+    num_words = max(1, stats.num_words)
     asl = num_words / num_sentences
-    asw = syllable_count / num_words
+    asw = stats.num_syllables / num_words
     if lang == 'ru':
         fkgl = (0.5 * asl) + (8.4 * asw) - 15.59
     elif lang == 'en':
@@ -39,26 +48,67 @@ def flesch_kincaid_grade_level(text, lang):
         fkgl = 0
     return fkgl
 
-def gunning_fog_index(text, lang):
-    sentences = sent_tokenize(text, language='russian' if lang == 'ru' else 'english')
-    words = [word for word in word_tokenize(text, language='russian' if lang == 'ru' else 'english') if word.isalpha()]
-    num_sentences = max(1, len(sentences))
-    num_words = max(1, len(words))
-    complex_words = [word for word in words if count_syllables(word, lang) >= 3]
-    percentage_complex = (len(complex_words) / num_words) * 100
+def gunning_fog_index(text, lang=None):
+    stats = _as_stats(text, lang)
+    num_sentences = max(1, stats.num_sentences)
+    num_words = max(1, stats.num_words)
+    percentage_complex = (stats.num_complex / num_words) * 100
     asl = num_words / num_sentences
     fog_index = 0.4 * (asl + percentage_complex)
     return fog_index
 
-def smog_index(text, lang):
-    sentences = sent_tokenize(text, language='russian' if lang == 'ru' else 'english')
-    words = [word for word in word_tokenize(text, language='russian' if lang == 'ru' else 'english') if word.isalpha()]
-    num_sentences = len(sentences)
-    complex_words = [word for word in words if count_syllables(word, lang) >= 3]
-    num_complex = len(complex_words)
+def smog_index(text, lang=None):
+    stats = _as_stats(text, lang)
+    num_sentences = stats.num_sentences
+    num_complex = stats.num_complex
     if num_sentences >= 3:
         smog = 1.0430 * ((num_complex * (30 / num_sentences)) ** 0.5) + 3.1291
     else:
         smog = 0
     return smog
 
+def compute_indices(text, lang):
+    # All four indices from a single tokenization pass
+    stats = _as_stats(text, lang)
+    return {
+        'flesch_reading_ease': flesch_reading_ease(stats),
+        'flesch_kincaid_grade_level': flesch_kincaid_grade_level(stats),
+        'gunning_fog_index': gunning_fog_index(stats),
+        'smog_index': smog_index(stats),
+    }
+
+def _window_sums(values, window):
+    # Sum over a window of `window` sentences centred on each sentence,
+    # clipped at the document edges; O(n) via a cumulative sum
+    totals = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+    index = np.arange(len(values))
+    start = np.clip(index - window // 2, 0, len(values))
+    end = np.clip(start + window, 0, len(values))
+    return totals[end] - totals[start], end - start
+
+def sentence_scores(words, syllables, complex_words, lang, window=1):
+    # Vectorized Flesch Reading Ease and Gunning Fog for every sentence (window=1)
+    # or for a sliding window of sentences around it. Inputs are per-sentence
+    # count arrays (TextStats.sentence_arrays()); sentences without words score NaN.
+    words = np.asarray(words)
+    word_sums, sentence_counts = _window_sums(words, window)
+    syllable_sums, _ = _window_sums(np.asarray(syllables), window)
+    complex_sums, _ = _window_sums(np.asarray(complex_words), window)
+
+    has_words = word_sums > 0
+    safe_words = np.where(has_words, word_sums, 1)
+    asl = word_sums / np.maximum(sentence_counts, 1)
+    asw = syllable_sums / safe_words
+    base, asl_weight, asw_weight = FRE_COEFFICIENTS.get(lang, (0, 0, 0))
+    fre = np.where(has_words, base - asl_weight * asl - asw_weight * asw, np.nan)
+    fog = np.where(has_words, 0.4 * (asl + complex_sums / safe_words * 100), np.nan)
+    return {'flesch_reading_ease': fre, 'gunning_fog_index': fog}
+
+def hardest_sentences(scores, n, higher_is_harder=False):
+    # Indices of the n hardest sentences, hardest first; NaN scores are skipped.
+    # Low FRE means hard; for Fog pass higher_is_harder=True.
+    keys = -scores if higher_is_harder else scores
+    candidates = np.flatnonzero(~np.isnan(keys))
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(keys[candidates], n)[:n]]
+    return candidates[np.argsort(keys[candidates], kind='stable')]
@@ -0,0 +1,165 @@
+# utils/result_cache.py
+#
+# Results keyed by content hash, language and model version, so Streamlit
+# reruns and repeat views of the same text skip extraction, detection,
+# readability, sentiment and translation work. An in-memory LRU bounded by
+# pickled size, optionally backed by a directory of pickle files.
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from . import metrics
+
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+# Set RESULT_CACHE_DIR to enable the on-disk tier
+DEFAULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR')
+DEFAULT_CACHE_MAX_DISK_BYTES = int(os.environ.get('RESULT_CACHE_MAX_DISK_BYTES', 2 * 1024 * 1024 * 1024))
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def make_key(stage, *parts):
+    return '|'.join(str(part) for part in (stage, *parts))
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES, disk_dir=DEFAULT_CACHE_DIR, max_disk_bytes=DEFAULT_CACHE_MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Running size of the disk tier: scanned once here, then kept up to date
+        # by put(). Other processes sharing the directory are only seen when a
+        # trim rescans it.
+        self._disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pkl')
+
+    def _remember(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def get(self, key):
+        # Returns (found, value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    payload = f.read()
+                value = pickle.loads(payload)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable cache entry for '{key}': {e}")
+            else:
+                with self._lock:
+                    self._remember(key, value, len(payload))
+                    self.disk_hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, value, len(payload))
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._disk_bytes += len(payload) - replaced
+                over_budget = self._disk_bytes > self.max_disk_bytes
+            if over_budget:
+                self._trim_disk()
+
+    def get_or_compute(self, key, compute):
+        found, value = self.get(key)
+        if not found:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _scan_disk(self):
+        # [(mtime, size, path)] of the cache files
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _trim_disk(self):
+        # Oldest files go first once the directory exceeds its budget
+        entries = self._scan_disk()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_disk_bytes:
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                if total <= self.max_disk_bytes * 0.9:
+                    break
+        with self._lock:
+            self._disk_bytes = total
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache():
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache()
+                metrics.register_hit_rate('result_cache', _result_cache.stats)
+    return _result_cache
@@ -0,0 +1,136 @@
+# utils/runtime_config.py
+#
+# Inference settings for Argos/CTranslate2 (translation) and torch (FinBERT)
+# in one place. The device is detected instead of assumed, so the app runs
+# CPU-first on machines without a GPU. Thread counts are split between the
+# worker processes of a pool instead of every worker grabbing all cores.
+#
+#   INFERENCE_DEVICE          auto (default), cpu or cuda
+#   INFERENCE_THREADS         intra-op threads per worker; default cores // workers
+#   TRANSLATION_COMPUTE_TYPE  CTranslate2 compute type: auto (default), int8,
+#                             int8_float32, float32, float16, ...
+#   TRANSLATION_BEAM_SIZE     beam width for translation, default 4 (1 = greedy)
+#
+# Argos reads its ARGOS_* settings when argostranslate is first imported, so
+# configure_translation() has to run before that, i.e. before the first
+# get_translation() in the process. The first configure_* call in a process
+# wins; later calls return the configuration already applied.
+
+import logging
+import os
+import sys
+import threading
+from . import metrics
+
+COMPUTE_TYPES = ('auto', 'int8', 'int8_float32', 'int8_float16', 'int16', 'float32', 'float16', 'bfloat16')
+
+_applied = {}
+_applied_lock = threading.Lock()
+
+def _requested_device():
+    device = os.environ.get('INFERENCE_DEVICE', 'auto').lower()
+    if device not in ('auto', 'cpu', 'cuda'):
+        logging.warning(f"Unknown INFERENCE_DEVICE '{device}', using auto.")
+        return 'auto'
+    return device
+
+def gpu_present():
+    # Cheap probe that imports nothing: an NVIDIA driver is loaded and no
+    # CUDA_VISIBLE_DEVICES hides the GPUs. The backends confirm it when applying.
+    if os.environ.get('CUDA_VISIBLE_DEVICES', None) in ('', '-1'):
+        return False
+    return os.path.exists('/proc/driver/nvidia/version')
+
+def get_runtime_config(workers=1):
+    # Settings for one worker of a pool of `workers` processes, as a dict
+    device = _requested_device()
+    if device == 'auto':
+        device = 'cuda' if gpu_present() else 'cpu'
+    threads = os.environ.get('INFERENCE_THREADS')
+    intra_threads = int(threads) if threads else max(1, (os.cpu_count() or 1) // max(1, workers))
+    compute_type = os.environ.get('TRANSLATION_COMPUTE_TYPE', 'auto').lower()
+    if compute_type not in COMPUTE_TYPES:
+        logging.warning(f"Unknown TRANSLATION_COMPUTE_TYPE '{compute_type}', using auto.")
+        compute_type = 'auto'
+    return {
+        'device': device,
+        'workers': workers,
+        'intra_threads': intra_threads,
+        'inter_threads': 1,
+        'compute_type': compute_type,
+        'beam_size': max(1, int(os.environ.get('TRANSLATION_BEAM_SIZE', 4))),
+    }
+
+def translation_settings_tag(config=None):
+    # Part of translation cache keys: compute type and beam size change the output
+    config = config or get_runtime_config()
+    return f"{config['compute_type']}-beam{config['beam_size']}"
+
+def _cuda_device_count_ctranslate2():
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count()
+    except Exception:
+        return 0
+
+def _publish(backend, config):
+    _applied[backend] = config
+    logging.info(
+        f"Runtime config ({backend}, pid {os.getpid()}): device={config['device']}, "
+        f"workers={config['workers']}, intra_threads={config['intra_threads']}, "
+        f"inter_threads={config['inter_threads']}, compute_type={config['compute_type']}, "
+        f"beam_size={config['beam_size']}"
+    )
+
+def configure_translation(workers=1):
+    # Argos/CTranslate2 settings for this process; returns the applied config
+    with _applied_lock:
+        if 'translation' in _applied:
+            return _applied['translation']
+        config = get_runtime_config(workers)
+        if config['device'] == 'cuda' and not _cuda_device_count_ctranslate2():
+            logging.warning("CTranslate2 sees no CUDA device; translating on CPU.")
+            config['device'] = 'cpu'
+        if 'argostranslate.settings' in sys.modules:
+            logging.warning("argostranslate was imported before configure_translation(); its settings are unchanged.")
+        os.environ['ARGOS_DEVICE_TYPE'] = config['device']
+        os.environ['ARGOS_INTER_THREADS'] = str(config['inter_threads'])
+        os.environ['ARGOS_INTRA_THREADS'] = str(config['intra_threads'])
+        os.environ['ARGOS_COMPUTE_TYPE'] = config['compute_type']
+        os.environ['ARGOS_BEAM_SIZE'] = str(config['beam_size'])
+        os.environ['OMP_NUM_THREADS'] = str(config['intra_threads'])
+        _publish('translation', config)
+        return config
+
+def configure_torch(workers=1):
+    # torch device and thread pools for this process; returns the applied config
+    with _applied_lock:
+        if 'torch' in _applied:
+            return _applied['torch']
+        import torch
+        config = get_runtime_config(workers)
+        if config['device'] == 'cuda' and not torch.cuda.is_available():
+            logging.warning("torch sees no CUDA device; running FinBERT on CPU.")
+            config['device'] = 'cpu'
+        torch.set_num_threads(config['intra_threads'])
+        try:
+            torch.set_num_interop_threads(config['inter_threads'])
+        except RuntimeError:
+            # Only allowed before the first parallel operation in the process
+            logging.debug("torch inter-op threads already fixed for this process.")
+        _publish('torch', config)
+        return config
+
+def applied_configs():
+    # {backend: config} for what this process has applied so far
+    return dict(_applied)
+
+def config_gauges():
+    # For metrics.register_gauge: one series per applied backend, value 1,
+    # the settings as labels (the usual "info" metric shape)
+    return {
+        (('backend', backend),) + tuple((key, str(value)) for key, value in sorted(config.items())): 1
+        for backend, config in applied_configs().items()
+    }
+
+metrics.register_gauge('runtime_config', config_gauges)
@@ -0,0 +1,151 @@
+# utils/sentiment.py
+#
+# FinBERT only sees 512 tokens per input, so long documents are split into
+# sentence-aligned token windows, classified in length-sorted batches and the
+# per-chunk scores aggregated into a document score.
+
+import os
+from .tokenizers import sent_tokenize, get_tokenizer, split_paragraphs
+from .result_cache import get_result_cache, content_hash, make_key
+from . import metrics
+
+DEFAULT_SENTIMENT_BATCH_SIZE = int(os.environ.get('SENTIMENT_BATCH_SIZE', 16))
+# 512 minus [CLS] and [SEP]
+MAX_CHUNK_TOKENS = 510
+
+def _split_long_sentence(ids, tokenizer, max_tokens):
+    return [tokenizer.decode(ids[i:i + max_tokens]) for i in range(0, len(ids), max_tokens)]
+
+def chunk_text(text, tokenizer, lang, max_tokens=MAX_CHUNK_TOKENS):
+    # Returns [(chunk_text, token_count)], packing whole sentences up to max_tokens
+    sentences = [
+        sentence
+        for paragraph in text.split('\n') if paragraph.strip()
+        for sentence in sent_tokenize(paragraph, lang)
+    ]
+    if not sentences:
+        return []
+    # One batched tokenizer call for the whole document
+    token_ids = tokenizer(sentences, add_special_tokens=False)['input_ids']
+
+    chunks = []
+    chunk = []
+    chunk_tokens = 0
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) > max_tokens:
+            if chunk:
+                chunks.append((' '.join(chunk), chunk_tokens))
+                chunk, chunk_tokens = [], 0
+            for piece in _split_long_sentence(ids, tokenizer, max_tokens):
+                chunks.append((piece, min(max_tokens, len(ids))))
+            continue
+        if chunk and chunk_tokens + len(ids) > max_tokens:
+            chunks.append((' '.join(chunk), chunk_tokens))
+            chunk, chunk_tokens = [], 0
+        chunk.append(sentence)
+        chunk_tokens += len(ids)
+    if chunk:
+        chunks.append((' '.join(chunk), chunk_tokens))
+    return chunks
+
+def classify_chunks(chunks, sentiment_analyzer, batch_size=DEFAULT_SENTIMENT_BATCH_SIZE):
+    # Returns one {label: score} dict per chunk, in chunk order
+    if not chunks:
+        return []
+    # Sorting by length keeps similarly sized chunks in one batch, so little padding is wasted
+    order = sorted(range(len(chunks)), key=lambda i: chunks[i][1])
+    with metrics.timer('sentiment_inference'):
+        outputs = sentiment_analyzer(
+            [chunks[i][0] for i in order], batch_size=batch_size, truncation=True, top_k=None
+        )
+    metrics.count('tokens', sum(tokens for _, tokens in chunks), stage='sentiment_inference')
+    scores = [None] * len(chunks)
+    for i, output in zip(order, outputs):
+        scores[i] = {item['label']: item['score'] for item in output}
+    return scores
+
+def aggregate_scores(chunks, scores):
+    # Token-weighted mean of the per-chunk label probabilities
+    total_tokens = sum(tokens for _, tokens in chunks) or 1
+    document = {}
+    for (_, tokens), chunk_scores in zip(chunks, scores):
+        for label, score in chunk_scores.items():
+            document[label] = document.get(label, 0.0) + score * tokens / total_tokens
+    return document
+
+def summarize_sentiment(chunks, scores):
+    if not chunks:
+        return None
+    document = aggregate_scores(chunks, scores)
+    label = max(document, key=document.get)
+
+    sections = []
+    for index, ((chunk, tokens), chunk_scores) in enumerate(zip(chunks, scores), start=1):
+        section_label = max(chunk_scores, key=chunk_scores.get)
+        sections.append({
+            'section': index,
+            'label': section_label,
+            'score': chunk_scores[section_label],
+            'tokens': tokens,
+            'preview': chunk[:80],
+        })
+
+    return {'label': label, 'score': document[label], 'scores': document, 'sections': sections}
+
+def analyze_sentiment(text, sentiment_analyzer, lang, batch_size=DEFAULT_SENTIMENT_BATCH_SIZE, max_tokens=MAX_CHUNK_TOKENS):
+    chunks = chunk_text(text, sentiment_analyzer.tokenizer, lang, max_tokens)
+    return summarize_sentiment(chunks, classify_chunks(chunks, sentiment_analyzer, batch_size))
+
+def analyze_sentiment_batch(items, sentiment_analyzer, batch_size=DEFAULT_SENTIMENT_BATCH_SIZE, max_tokens=MAX_CHUNK_TOKENS):
+    # items: [(text, lang)]. The chunks of all documents go through the
+    # pipeline together, so short documents share batches.
+    per_document = [chunk_text(text, sentiment_analyzer.tokenizer, lang, max_tokens) for text, lang in items]
+    all_chunks = [chunk for chunks in per_document for chunk in chunks]
+    all_scores = classify_chunks(all_chunks, sentiment_analyzer, batch_size)
+
+    results = []
+    start = 0
+    for chunks in per_document:
+        results.append(summarize_sentiment(chunks, all_scores[start:start + len(chunks)]))
+        start += len(chunks)
+    return results
+
+def analyze_sentiment_incremental(text, sentiment_analyzer, lang, model_version, cache=None,
+                                  batch_size=DEFAULT_SENTIMENT_BATCH_SIZE, max_tokens=MAX_CHUNK_TOKENS):
+    # Like analyze_sentiment, but chunks never cross paragraph boundaries and
+    # each paragraph's (chunk, scores) pairs are cached under its content hash,
+    # so after an edit only the changed paragraphs go through the model.
+    # Chunks are batched by length, so short paragraph-sized chunks cost about
+    # as much inference as packed ones.
+    cache = cache or get_result_cache()
+    backend = get_tokenizer().name
+    paragraphs = [paragraph for paragraph in split_paragraphs(text) if paragraph.strip()]
+    keys = [
+        make_key('sentiment-paragraph', content_hash(paragraph), lang, model_version, max_tokens, backend)
+        for paragraph in paragraphs
+    ]
+
+    scored = {}
+    missing = {}
+    for key, paragraph in zip(keys, paragraphs):
+        found, value = cache.get(key)
+        if found:
+            scored[key] = value
+        else:
+            missing.setdefault(key, paragraph)
+
+    # All changed paragraphs go through the pipeline together
+    per_paragraph = {key: chunk_text(paragraph, sentiment_analyzer.tokenizer, lang, max_tokens) for key, paragraph in missing.items()}
+    all_chunks = [chunk for chunks in per_paragraph.values() for chunk in chunks]
+    all_scores = classify_chunks(all_chunks, sentiment_analyzer, batch_size)
+    start = 0
+    for key, chunks in per_paragraph.items():
+        scored[key] = list(zip(chunks, all_scores[start:start + len(chunks)]))
+        start += len(chunks)
+        cache.put(key, scored[key])
+    metrics.count('paragraphs', len(paragraphs) - len(missing), stage='sentiment', cached='true')
+    metrics.count('paragraphs', len(missing), stage='sentiment', cached='false')
+
+    chunks = [chunk for key in keys for chunk, _ in scored[key]]
+    scores = [chunk_scores for key in keys for _, chunk_scores in scored[key]]
+    return summarize_sentiment(chunks, scores)
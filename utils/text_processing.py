@@ -1,26 +1,159 @@
 # utils/text_processing.py
 
-from langdetect import detect, DetectorFactory
-import pyphen
+from array import array
+from functools import lru_cache
+import re
+import threading
+from . import metrics
 
-# Ensure consistent language detection
-DetectorFactory.seed = 0
+# Word frequencies are Zipfian, so a bounded memo covers most of any real text
+SYLLABLE_CACHE_SIZE = 200_000
 
-def detect_language(text):
+KK_VOWELS = "аеёиоуыэюяіүұөө"
+
+_dictionaries = {}
+_dictionaries_lock = threading.Lock()
+
+# Letters that occur in Kazakh but not in Russian. 'і' is left out: Ukrainian
+# and Belarusian use it too.
+KK_STRONG_LETTERS = frozenset("үұөңғқәһ")
+# Share of Cyrillic words that must contain a Kazakh letter to call a text
+# Kazakh. Every sentence of ordinary Kazakh text is well above it; a Russian
+# text quoting a few Kazakh names is not. Below it langdetect decides.
+KK_WORD_SHARE = 0.25
+# langdetect only ever sees this many characters, sampled across the document
+DETECTION_SAMPLE_CHARS = 3000
+MIN_PARAGRAPH_CHARS = 40
+# Per-paragraph detection (mixed-language warning) looks at this many
+# paragraphs at most, and at this many characters of each
+MAX_DETECTED_PARAGRAPHS = 20
+PARAGRAPH_SAMPLE_CHARS = 600
+
+def _sample_text(text, sample_chars=DETECTION_SAMPLE_CHARS):
+    # Windows from the start, middle and end, cut at whitespace, so long
+    # documents cost the same as short ones
+    if len(text) <= sample_chars:
+        return text
+    window = sample_chars // 3
+    parts = []
+    for start in (0, (len(text) - window) // 2, len(text) - window):
+        part = text[start:start + window]
+        # Drop the words cut by the window edges; a window may be all whitespace
+        if start:
+            part = (part.split(None, 1) or [''])[-1]
+        if start + window < len(text):
+            part = (part.rsplit(None, 1) or [''])[0]
+        if part:
+            parts.append(part)
+    return ' '.join(parts)
+
+_WORD = re.compile(r'[^\W\d_]+')
+
+def _is_cyrillic(char):
+    return '\u0400' <= char <= '\u04ff'
+
+def _script_profile(sample):
+    # (Cyrillic letters, Latin letters, Cyrillic words, words with Kazakh letters)
+    cyrillic = latin = cyrillic_words = kk_words = 0
+    for word in _WORD.findall(sample.lower()):
+        word_cyrillic = sum(1 for char in word if _is_cyrillic(char))
+        cyrillic += word_cyrillic
+        latin += sum(1 for char in word if 'a' <= char <= 'z')
+        if word_cyrillic:
+            cyrillic_words += 1
+            if not KK_STRONG_LETTERS.isdisjoint(word):
+                kk_words += 1
+    return cyrillic, latin, cyrillic_words, kk_words
+
+def _statistical_guess(sample):
+    # Imported on first use; loading langdetect's profiles is not free
+    from langdetect import detect_langs, DetectorFactory, LangDetectException
+    # Ensure consistent language detection
+    DetectorFactory.seed = 0
     try:
-        lang = detect(text)
-        if lang not in ['ru', 'en', 'kk']:
-            return None
-        return lang
-    except:
-        return None
+        best = detect_langs(sample)[0]
+    except LangDetectException:
+        return None, 0.0
+    return best.lang, best.prob
 
-def count_syllables(word, lang):
+@metrics.timed('detect_language')
+def detect_language_with_confidence(text, sample_chars=DETECTION_SAMPLE_CHARS):
+    # Returns (lang, confidence) with lang in 'ru', 'en', 'kk' or None.
+    # Unicode script decides first; langdetect only confirms, on a bounded sample.
+    sample = _sample_text(text, sample_chars)
+    cyrillic, latin, cyrillic_words, kk_words = _script_profile(sample)
+    letters = cyrillic + latin
+    if not letters:
+        return None, 0.0
+
+    if cyrillic >= latin:
+        script_share = cyrillic / letters
+        kk_share = kk_words / cyrillic_words
+        if kk_share >= KK_WORD_SHARE:
+            # langdetect has no Kazakh profile, so the letters are the evidence
+            return 'kk', script_share * min(1.0, kk_share / (2 * KK_WORD_SHARE) + 0.5)
+        # Weak or no Kazakh evidence: Russian if langdetect agrees; Ukrainian
+        # and other Cyrillic languages are not supported
+        lang, prob = _statistical_guess(sample)
+        if lang == 'ru':
+            return 'ru', script_share * prob
+        return None, 0.0
+
+    lang, prob = _statistical_guess(sample)
+    if lang == 'en':
+        return 'en', latin / letters * prob
+    return None, 0.0
+
+def detect_language(text):
+    return detect_language_with_confidence(text)[0]
+
+def detect_paragraph_languages(text, min_chars=MIN_PARAGRAPH_CHARS, max_paragraphs=MAX_DETECTED_PARAGRAPHS,
+                               sample_chars=PARAGRAPH_SAMPLE_CHARS):
+    # [(paragraph_index, lang, confidence)] for mixed-language documents. Only
+    # paragraphs of at least min_chars are judged, and at most max_paragraphs
+    # of them, spread evenly over the document, each on a short sample; the
+    # cost stays bounded however long the document is.
+    candidates = [
+        (index, paragraph) for index, paragraph in enumerate(text.split('\n'))
+        if len(paragraph.strip()) >= min_chars
+    ]
+    if len(candidates) > max_paragraphs:
+        step = len(candidates) / max_paragraphs
+        candidates = [candidates[int(i * step)] for i in range(max_paragraphs)]
+    return [
+        (index, *detect_language_with_confidence(paragraph, sample_chars))
+        for index, paragraph in candidates
+    ]
+
+def get_hyphenation_dictionary(lang):
+    # Loading a pyphen dictionary is expensive; build one per language and reuse it
+    dic = _dictionaries.get(lang)
+    if dic is None:
+        with _dictionaries_lock:
+            dic = _dictionaries.get(lang)
+            if dic is None:
+                import pyphen
+                dic = pyphen.Pyphen(lang=lang)
+                _dictionaries[lang] = dic
+    return dic
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def _count_syllables_cached(word, lang):
     if lang == 'kk':
-        vowels = "аеёиоуыэюяіүұөө"
-        syllables = sum(1 for char in word.lower() if char in vowels)
+        syllables = sum(1 for char in word.lower() if char in KK_VOWELS)
         return max(1, syllables)
     else:
-        dic = pyphen.Pyphen(lang=lang)
-        hyphens = dic.inserted(word)
+        hyphens = get_hyphenation_dictionary(lang).inserted(word)
         return max(1, hyphens.count('-') + 1)
+
+def count_syllables(word, lang):
+    return _count_syllables_cached(word, lang)
+
+def count_syllables_batch(words, lang):
+    # Compact unsigned 16-bit array, one syllable count per word
+    return array('H', (_count_syllables_cached(word, lang) for word in words))
+
+def syllable_cache_info():
+    return _count_syllables_cached.cache_info()
+
+metrics.register_hit_rate('syllables', lambda: syllable_cache_info()._asdict())
@@ -0,0 +1,104 @@
+# utils/text_stats.py
+
+from array import array
+import numpy as np
+from .tokenizers import get_tokenizer, split_paragraphs
+from .text_processing import count_syllables_batch
+from .result_cache import get_result_cache, content_hash, make_key
+from . import metrics
+
+# Words with at least this many syllables count as "complex" (Gunning Fog, SMOG)
+COMPLEX_WORD_SYLLABLES = 3
+
+def _segment_sums(values, lengths):
+    # Sum of each consecutive run of `lengths` values; empty runs sum to 0
+    totals = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    ends = np.cumsum(lengths, dtype=np.int64)
+    return totals[ends] - totals[ends - lengths]
+
+class TextStats:
+    # Everything the readability indices need, computed once per text/language
+    def __init__(self, lang, num_sentences, words, syllables, sentences=None, sentence_word_counts=None,
+                 num_syllables=None, num_complex=None):
+        self.lang = lang
+        self.num_sentences = num_sentences
+        self.words = words
+        self.syllables = syllables
+        self.num_syllables = sum(syllables) if num_syllables is None else num_syllables
+        if num_complex is None:
+            num_complex = sum(1 for count in syllables if count >= COMPLEX_WORD_SYLLABLES)
+        self.num_complex = num_complex
+        # Per-sentence breakdown, when the caller kept the sentence boundaries
+        self.sentences = sentences
+        self.sentence_word_counts = sentence_word_counts
+
+    @property
+    def num_words(self):
+        return len(self.words)
+
+    @classmethod
+    def merge(cls, lang, parts):
+        # Document stats from per-paragraph stats; totals are added up, not recounted
+        words = []
+        syllables = array('H')
+        sentences = []
+        sentence_word_counts = []
+        for part in parts:
+            words.extend(part.words)
+            syllables.extend(part.syllables)
+            sentences.extend(part.sentences)
+            sentence_word_counts.extend(part.sentence_word_counts)
+        return cls(
+            lang, sum(part.num_sentences for part in parts), words, syllables, sentences, sentence_word_counts,
+            num_syllables=sum(part.num_syllables for part in parts),
+            num_complex=sum(part.num_complex for part in parts),
+        )
+
+    def sentence_arrays(self):
+        # (words, syllables, complex words) per sentence as int arrays, or None
+        if self.sentence_word_counts is None:
+            return None
+        lengths = np.asarray(self.sentence_word_counts, dtype=np.int64)
+        syllables = np.frombuffer(self.syllables, dtype=np.uint16) if len(self.syllables) else np.zeros(0, np.uint16)
+        complex_words = syllables >= COMPLEX_WORD_SYLLABLES
+        return lengths, _segment_sums(syllables, lengths), _segment_sums(complex_words, lengths)
+
+def compute_text_stats(text, lang):
+    tokenizer = get_tokenizer()
+    with metrics.timer('tokenize', lang=lang, backend=tokenizer.name):
+        sentences = tokenizer.sent_tokenize(text, lang)
+        words = []
+        sentence_word_counts = []
+        for sentence in sentences:
+            sentence_words = tokenizer.sentence_words(sentence, lang)
+            words.extend(sentence_words)
+            sentence_word_counts.append(len(sentence_words))
+    with metrics.timer('syllabify', lang=lang):
+        syllables = count_syllables_batch(words, lang)
+    metrics.count('characters', len(text), stage='tokenize')
+    metrics.count('words', len(words), stage='tokenize')
+    return TextStats(lang, len(sentences), words, syllables, sentences, sentence_word_counts)
+
+def compute_document_stats(text, lang, cache=None):
+    # compute_text_stats() paragraph by paragraph, with each paragraph's stats
+    # cached under its content hash. Re-analysing an edited document only
+    # tokenizes and syllabifies the paragraphs that changed. Paragraphs are
+    # lines; PDF text has its soft line breaks joined when it is read.
+    cache = cache or get_result_cache()
+    backend = get_tokenizer().name
+    parts = []
+    reused = 0
+    for paragraph in split_paragraphs(text):
+        if not paragraph.strip():
+            continue
+        key = make_key('paragraph-stats', content_hash(paragraph), lang, backend)
+        found, stats = cache.get(key)
+        if found:
+            reused += 1
+        else:
+            stats = compute_text_stats(paragraph, lang)
+            cache.put(key, stats)
+        parts.append(stats)
+    metrics.count('paragraphs', reused, stage='text_stats', cached='true')
+    metrics.count('paragraphs', len(parts) - reused, stage='text_stats', cached='false')
+    return TextStats.merge(lang, parts)
@@ -0,0 +1,234 @@
+# utils/tokenizers.py
+#
+# Sentence and word tokenization behind one interface, so readability,
+# sentiment chunking and translation splitting do not depend on NLTK data
+# being downloadable. Two backends:
+#
+#   nltk   punkt + Treebank, the reference implementation
+#   regex  precompiled patterns for ru/en/kk with abbreviation and initials
+#          handling; needs no downloaded data
+#
+# TOKENIZER_BACKEND selects one of them; the default 'auto' uses NLTK when
+# the punkt data is present and falls back to regex otherwise.
+
+import logging
+import os
+import re
+import threading
+
+DEFAULT_TOKENIZER_BACKEND = os.environ.get('TOKENIZER_BACKEND', 'auto')
+
+def nltk_language(lang):
+    return 'russian' if lang == 'ru' else 'english'
+
+# Lower-case abbreviations that do not end a sentence when followed by a
+# period; titles, units and references that precede a name or a number.
+# Multi-part ones are written without the final period.
+ABBREVIATIONS = {
+    'en': {
+        'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'fig', 'vol', 'pp', 'approx', 'dept',
+        'gov', 'cf', 'jan', 'feb', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+        'e.g', 'i.e', 'a.m', 'p.m', 'u.s', 'u.k',
+    },
+    'ru': {
+        'г', 'гг', 'в', 'вв', 'с', 'пр', 'им', 'ул', 'д', 'кв', 'стр', 'рис', 'см', 'напр', 'проф', 'акад',
+        'доц', 'ок', 'гл', 'п', 'пп', 'ст', 'ч', 'т', 'тт', 'изд', 'обл', 'р-н', 'пос', 'просп', 'корп',
+        'т.е', 'т.к', 'т.н', 'т.о', 'и.о',
+    },
+    'kk': {
+        'ж', 'жж', 'ғ', 'ғғ', 'қ', 'көш', 'үй', 'пәт', 'мыс', 'б', 'бб', 'т', 'тт', 'обл', 'ауд', 'проф',
+        'акад', 'ст', 'бет', 'сур', 'б.з.б', 'б.з',
+    },
+}
+# Abbreviations that often close a sentence ("... and Co.", "3 млн руб.",
+# "и т.д."): not a boundary before lower case, a boundary before upper case
+TERMINAL_ABBREVIATIONS = {
+    'en': {'etc', 'inc', 'ltd', 'co', 'corp', 'bn', 'mln'},
+    'ru': {'др', 'тыс', 'млн', 'млрд', 'трлн', 'руб', 'коп', 'долл', 'мин', 'сек', 'кг', 'т.д', 'т.п', 'н.э'},
+    'kk': {'млн', 'млрд', 'трлн', 'мың', 'тг', 'т.б', 'т.с.с', 'ж.т.б'},
+}
+
+# Terminal punctuation, any closing quotes or brackets, then whitespace
+_SENTENCE_END = re.compile(r'([.!?…]+)(["»”’\')\]]*)\s+(?=\S)')
+# The token right before a period, without leading quotes or brackets
+_LAST_TOKEN = re.compile(r'[^\s"«“„(\[]+$')
+# Dotted abbreviations and initials such as "т.е", "e.g", "U.S", "А.С"
+_DOTTED = re.compile(r'^(?:\w\.)+\w$')
+
+def _word_pattern(lang):
+    # Treebank-like tokens: known abbreviations with their period, hyphenated
+    # compounds and English contractions stay whole, punctuation stands alone
+    abbreviations = sorted(ABBREVIATIONS[lang] | TERMINAL_ABBREVIATIONS[lang], key=len, reverse=True)
+    abbreviation = '|'.join(re.escape(a) for a in abbreviations)
+    return re.compile(
+        rf"(?i:\b(?:{abbreviation})\.)(?!\w)"
+        r"|\w(?:\.\w)+\.?"
+        r"|\w+(?:-\w+)+"
+        r"|\w+(?=n['’]t\b)|n['’]t\b"
+        r"|['’]\w+"
+        r"|\w+"
+        r"|[^\w\s]"
+    )
+
+_WORD_PATTERNS = {lang: _word_pattern(lang) for lang in ABBREVIATIONS}
+
+class RegexTokenizer:
+    name = 'regex'
+
+    def _is_boundary(self, text, match, lang):
+        terminator = match.group(1)
+        next_char = text[match.end()]
+        if '!' in terminator or '?' in terminator:
+            return True
+        if next_char.islower():
+            # "т.е. для", "etc. and", "... and then"
+            return False
+        if terminator != '.':
+            return True
+        token = _LAST_TOKEN.search(text, max(0, match.start() - 40), match.start())
+        if token is None:
+            return True
+        token = token.group()
+        if token.lower() in ABBREVIATIONS.get(lang, ABBREVIATIONS['en']):
+            return False
+        if token.lower() in TERMINAL_ABBREVIATIONS.get(lang, TERMINAL_ABBREVIATIONS['en']):
+            return True
+        # Initials: "А. С. Пушкин", "J. R. R. Tolkien"
+        if len(token) == 1 and token.isalpha() and token.isupper():
+            return False
+        return _DOTTED.match(token) is None
+
+    def sent_tokenize(self, text, lang):
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(text):
+            if self._is_boundary(text, match, lang):
+                sentence = text[start:match.end()].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = match.end()
+        tail = text[start:].strip()
+        if tail:
+            sentences.append(tail)
+        return sentences
+
+    def _sentence_tokens(self, sentence, lang):
+        # Like Treebank, only the period that ends a sentence is split off, so
+        # "no." at the end of a sentence is a word while "Mr." inside one is not
+        pattern = _WORD_PATTERNS.get(lang, _WORD_PATTERNS['en'])
+        if sentence.endswith('.') and not sentence.endswith('..'):
+            return pattern.findall(sentence[:-1]) + ['.']
+        return pattern.findall(sentence)
+
+    def word_tokenize(self, text, lang):
+        tokens = []
+        for sentence in self.sent_tokenize(text, lang):
+            tokens.extend(self._sentence_tokens(sentence, lang))
+        return tokens
+
+    def words(self, text, lang):
+        # Alphabetic tokens only; what the readability formulas count
+        return [token for token in self.word_tokenize(text, lang) if token.isalpha()]
+
+    def sentence_words(self, sentence, lang):
+        # words() for a single sentence that sent_tokenize already produced
+        return [token for token in self._sentence_tokens(sentence, lang) if token.isalpha()]
+
+class NltkTokenizer:
+    name = 'nltk'
+
+    def __init__(self):
+        from nltk.tokenize import sent_tokenize, word_tokenize
+        self._sent_tokenize = sent_tokenize
+        self._word_tokenize = word_tokenize
+
+    def sent_tokenize(self, text, lang):
+        return self._sent_tokenize(text, language=nltk_language(lang))
+
+    def word_tokenize(self, text, lang):
+        return self._word_tokenize(text, language=nltk_language(lang))
+
+    def words(self, text, lang):
+        return [token for token in self.word_tokenize(text, lang) if token.isalpha()]
+
+    def sentence_words(self, sentence, lang):
+        # preserve_line skips the sentence split word_tokenize would repeat
+        tokens = self._word_tokenize(sentence, language=nltk_language(lang), preserve_line=True)
+        return [token for token in tokens if token.isalpha()]
+
+TOKENIZER_BACKENDS = {'regex': RegexTokenizer, 'nltk': NltkTokenizer}
+
+def punkt_available():
+    try:
+        import nltk
+        nltk.data.find('tokenizers/punkt_tab')
+    except (ImportError, LookupError):
+        return False
+    return True
+
+_tokenizers = {}
+_tokenizers_lock = threading.Lock()
+
+def get_tokenizer(backend=None):
+    backend = backend or DEFAULT_TOKENIZER_BACKEND
+    tokenizer = _tokenizers.get(backend)
+    if tokenizer is None:
+        with _tokenizers_lock:
+            tokenizer = _tokenizers.get(backend)
+            if tokenizer is None:
+                if backend == 'auto':
+                    resolved = 'nltk' if punkt_available() else 'regex'
+                    logging.info(f"Using the '{resolved}' tokenizer backend.")
+                    tokenizer = TOKENIZER_BACKENDS[resolved]()
+                elif backend in TOKENIZER_BACKENDS:
+                    tokenizer = TOKENIZER_BACKENDS[backend]()
+                else:
+                    raise ValueError(f"Unknown tokenizer backend '{backend}'; expected one of {sorted(TOKENIZER_BACKENDS)} or 'auto'.")
+                _tokenizers[backend] = tokenizer
+    return tokenizer
+
+def sent_tokenize(text, lang):
+    return get_tokenizer().sent_tokenize(text, lang)
+
+def words(text, lang):
+    return get_tokenizer().words(text, lang)
+
+# In PDF-extracted text, a line that ends like this closes its paragraph; a
+# line that does not is hard-wrapped (PDF text has a newline after every
+# visual line) and continues on the next one, unless that one is blank or
+# starts a list item
+_PARAGRAPH_END = re.compile(r'[.!?…:;]["»”’\')\]]*\s*$')
+_LIST_ITEM = re.compile(r'\s*(?:[•▪◦*\-–—]|\d+[.)])\s')
+
+def join_soft_line_breaks(text):
+    # PDF text with its soft line breaks joined, so sentences that cross a
+    # line break stay whole; one line per paragraph, blank lines kept. Only
+    # for PDF output: in .txt and .docx text every newline is a real break.
+    paragraphs = []
+    current = None
+    for line in text.split('\n'):
+        if not line.strip():
+            if current is not None:
+                paragraphs.append(current)
+                current = None
+            paragraphs.append(line)
+            continue
+        if current is None:
+            current = line
+        elif _LIST_ITEM.match(line):
+            paragraphs.append(current)
+            current = line
+        else:
+            current = current.rstrip() + ' ' + line.lstrip()
+        if _PARAGRAPH_END.search(current):
+            paragraphs.append(current)
+            current = None
+    if current is not None:
+        paragraphs.append(current)
+    return '\n'.join(paragraphs)
+
+def split_paragraphs(text):
+    # Every line is a paragraph (headings and label lines included); blank
+    # lines are kept as empty paragraphs. read_pdf has already joined the
+    # soft line breaks of PDF text.
+    return text.split('\n')
@@ -2,23 +2,70 @@
 
 import streamlit as st
 import re
-import torch
-from torch.amp import autocast
 import traceback
 
 
-def translate_text(input_text, src_lang, tgt_lang, translation_pipelines):
+# Upper bound on padded tokens per generation batch (batch size x longest input)
+DEFAULT_TOKEN_BUDGET = 16384
+
+
+def _split_long_sentence(sentence, tokenizer, max_tokens):
+    # Greedy word packing, preferring to break after clause punctuation once a
+    # piece is reasonably full; returns the token ids of each piece
+    words = sentence.split()
+    word_lengths = [len(ids) for ids in tokenizer(words, add_special_tokens=False)['input_ids']]
+    # Leave room for the special tokens added when the piece is encoded
+    limit = max_tokens - 2
+    parts = []
+    current = []
+    current_tokens = 0
+    for word, length in zip(words, word_lengths):
+        if current and current_tokens + length > limit:
+            parts.append(' '.join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += length
+        if current_tokens >= limit * 0.7 and word[-1] in ',;:':
+            parts.append(' '.join(current))
+            current, current_tokens = [], 0
+    if current:
+        parts.append(' '.join(current))
+    # A single word longer than the limit still has to fit the model; the
+    # tokenizer truncates before adding the special tokens, so EOS is kept
+    return tokenizer(parts, truncation=True, max_length=max_tokens)['input_ids']
+
+
+def _length_bucketed_batches(segments, token_budget):
+    order = sorted(range(len(segments)), key=lambda i: len(segments[i]))
+    batch = []
+    for i in order:
+        # Sorted ascending, so segment i is the longest in the batch once added
+        if batch and (len(batch) + 1) * len(segments[i]) > token_budget:
+            yield batch
+            batch = []
+        batch.append(i)
+    if batch:
+        yield batch
+
+
+def translate_text(input_text, src_lang, tgt_lang, translation_pipelines, num_beams=5, max_length=512,
+                   token_budget=DEFAULT_TOKEN_BUDGET):
     if (src_lang, tgt_lang) not in translation_pipelines or translation_pipelines[(src_lang, tgt_lang)] is None:
         st.error(f"Перевод с {src_lang} на {tgt_lang} не поддерживается.")
         return ""
 
+    # Imported here rather than at module level; torch alone takes seconds to import
+    import torch
+    from torch.amp import autocast
+    from .runtime_config import configure_torch
+
     try:
         translation_pipeline = translation_pipelines[(src_lang, tgt_lang)]
         tokenizer = translation_pipeline.tokenizer
         model = translation_pipeline.model
 
         # Ensure the device is correctly set
-        device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+        device = torch.device("cuda:0" if configure_torch()['device'] == 'cuda' else "cpu")
         print(f"Using device: {device}")
 
         # Step 1: Remove multiple spaces
@@ -29,47 +76,49 @@ def translate_text(input_text, src_lang, tgt_lang, translation_pipelines):
 
         # Step 3: Trim each sentence to get rid of extra spaces at the beginning and at the end
         sentences = [s.strip() for s in sentences if s.strip()]  # Remove empty strings
+        if not sentences:
+            return ""
 
         # Set maximum token limit (slightly less than model's max to account for special tokens)
         max_tokens = 460
 
-        # Prepare sentences and check for token length
-        sentences_to_translate = []
-        for sentence in sentences:
-            # Encode the sentence to get the number of tokens
-            sentence_tokens = tokenizer.encode(sentence, return_tensors='pt').to(device)
-            sentence_token_count = sentence_tokens.shape[1]
-
-            if sentence_token_count > max_tokens:
-                # If the sentence exceeds max_tokens, raise an error
-                st.error(
-                    f"Предложение слишком длинное для перевода (более {max_tokens} токенов). Пожалуйста, упростите это предложение:\n\n{sentence}")
-                return ""
-
-            sentences_to_translate.append(sentence)
-
-        # Translate sentences in batches
-        batch_size = 256  # Adjust batch size as needed
-        translated_sentences = []
-        for i in range(0, len(sentences_to_translate), batch_size):
-            batch = sentences_to_translate[i:i + batch_size]
-
-            # Tokenize the batch and move inputs to GPU
-            inputs = tokenizer(batch, return_tensors='pt', padding=True, truncation=True).to(device)
+        # Tokenize every sentence once; the ids are reused for generation
+        token_ids = tokenizer(sentences, truncation=False)['input_ids']
+
+        # Sentences over the limit are split into pieces instead of being rejected;
+        # pieces[i] lists the segment indices that make up sentence i
+        segments = []
+        pieces = []
+        for sentence, ids in zip(sentences, token_ids):
+            if len(ids) > max_tokens:
+                split = _split_long_sentence(sentence, tokenizer, max_tokens)
+            else:
+                split = [ids]
+            pieces.append(list(range(len(segments), len(segments) + len(split))))
+            segments.extend(split)
+
+        # Translate in length-sorted batches so each batch pads to similar lengths,
+        # sized by a padded-token budget rather than a fixed sentence count
+        segment_translations = [None] * len(segments)
+        for batch in _length_bucketed_batches(segments, token_budget):
+            inputs = tokenizer.pad({'input_ids': [segments[i] for i in batch]}, return_tensors='pt').to(device)
 
             # Generate translations using the model with autocast
             with torch.no_grad():
                 with autocast(device_type=device.type):
                     translated_tokens = model.generate(
                         **inputs,
-                        max_length=512,
-                        num_beams=5,
+                        max_length=max_length,
+                        num_beams=num_beams,
                         early_stopping=True
                     )
 
             # Decode translations
             batch_translations = tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)
-            translated_sentences.extend(batch_translations)
+            for i, translation in zip(batch, batch_translations):
+                segment_translations[i] = translation
+
+        translated_sentences = [' '.join(segment_translations[i] for i in indices) for indices in pieces]
 
         # Combine translated sentences
         translated_text = '. '.join(translated_sentences)
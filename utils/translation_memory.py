@@ -0,0 +1,139 @@
+# utils/translation_memory.py
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from . import metrics
+
+DEFAULT_TM_PATH = os.environ.get('TRANSLATION_MEMORY_PATH', 'cache/translation_memory.sqlite3')
+# Evict least recently used entries once the stored text exceeds this many bytes
+DEFAULT_TM_MAX_BYTES = int(os.environ.get('TRANSLATION_MEMORY_MAX_BYTES', 256 * 1024 * 1024))
+
+def normalize_sentence(sentence):
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', sentence)).strip()
+
+def sentence_key(sentence, src_lang, tgt_lang, model_version):
+    payload = f"{src_lang}\x1f{tgt_lang}\x1f{model_version}\x1f{normalize_sentence(sentence)}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class TranslationMemory:
+    def __init__(self, path=DEFAULT_TM_PATH, max_bytes=DEFAULT_TM_MAX_BYTES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tm ('
+            ' key TEXT PRIMARY KEY,'
+            ' translation TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS tm_last_used ON tm (last_used)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM tm').fetchone()[0]
+
+    def get_many(self, sentences, src_lang, tgt_lang, model_version):
+        # Returns {sentence: translation} for the sentences already in memory
+        keys = {sentence_key(s, src_lang, tgt_lang, model_version): s for s in set(sentences)}
+        found = {}
+        with self._lock:
+            key_list = list(keys)
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(key_list), 500):
+                batch = key_list[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f'SELECT key, translation FROM tm WHERE key IN ({placeholders})', batch
+                ).fetchall()
+                for key, translation in rows:
+                    found[keys[key]] = translation
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    'UPDATE tm SET last_used = ? WHERE key = ?',
+                    [(now, sentence_key(s, src_lang, tgt_lang, model_version)) for s in found],
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, translations, src_lang, tgt_lang, model_version):
+        # translations: {sentence: translation}
+        now = time.time()
+        # Sentences that normalize alike share a key; the last one wins
+        rows = {}
+        for sentence, translation in translations.items():
+            size = len(sentence.encode('utf-8')) + len(translation.encode('utf-8'))
+            key = sentence_key(sentence, src_lang, tgt_lang, model_version)
+            rows[key] = (key, translation, size, now)
+        if not rows:
+            return
+        with self._lock:
+            # Replaced rows no longer count towards the total
+            key_list = list(rows)
+            replaced = 0
+            for i in range(0, len(key_list), 500):
+                batch = key_list[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                replaced += self._conn.execute(
+                    f'SELECT COALESCE(SUM(size), 0) FROM tm WHERE key IN ({placeholders})', batch
+                ).fetchone()[0]
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO tm (key, translation, size, last_used) VALUES (?, ?, ?, ?)', rows.values()
+            )
+            self._conn.commit()
+            self._total_bytes += sum(row[2] for row in rows.values()) - replaced
+            if self._total_bytes > self.max_bytes:
+                # Other processes write to the same file; recount before evicting
+                self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM tm').fetchone()[0]
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries down to 90% of the size budget
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in self._conn.execute('SELECT key, size FROM tm ORDER BY last_used').fetchall():
+            if self._total_bytes <= target:
+                break
+            self._conn.execute('DELETE FROM tm WHERE key = ?', (key,))
+            self._total_bytes -= size
+            evicted += 1
+        self._conn.commit()
+        logging.debug(f"Translation memory evicted {evicted} entries.")
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM tm').fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+_translation_memory = None
+_translation_memory_lock = threading.Lock()
+
+def get_translation_memory():
+    global _translation_memory
+    if _translation_memory is None:
+        with _translation_memory_lock:
+            if _translation_memory is None:
+                _translation_memory = TranslationMemory()
+                metrics.register_hit_rate('translation_memory', _translation_memory.stats)
+    return _translation_memory
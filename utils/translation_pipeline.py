@@ -0,0 +1,178 @@
+# utils/translation_pipeline.py
+#
+# Structure-preserving, chunked Argos translation. The document is split into
+# paragraphs and sentences, sentences missing from the translation memory are
+# packed into token-budgeted chunks and translated on a pool of worker
+# processes that each keep a warm translator, then the paragraphs are
+# reassembled in their original order.
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from .tokenizers import sent_tokenize, split_paragraphs
+from .translation_memory import get_translation_memory
+from .translator_registry import get_translation, package_version, translate_batch
+from .runtime_config import configure_translation, translation_settings_tag
+from . import metrics
+
+DEFAULT_WORKERS = int(os.environ.get('TRANSLATION_WORKERS', min(4, os.cpu_count() or 1)))
+# Rough source-token budget per chunk sent to a worker
+DEFAULT_TOKEN_BUDGET = int(os.environ.get('TRANSLATION_CHUNK_TOKENS', 400))
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Per-process translator, warmed up once by the pool initializer
+_worker_translation = None
+
+def model_version(translation, src_lang, tgt_lang):
+    # get_installed_languages() wraps each package in a CachedTranslation,
+    # which package_version() unwraps
+    version = package_version(translation) or 'unknown'
+    return f"argos-{src_lang}-{tgt_lang}-{version}-{translation_settings_tag()}"
+
+def split_document(paragraphs, lang):
+    # One list of sentences per paragraph (see split_paragraphs); blank lines
+    # are kept as empty paragraphs
+    return [sent_tokenize(paragraph, lang) if paragraph.strip() else [] for paragraph in paragraphs]
+
+def estimate_tokens(sentence):
+    # Subword models produce roughly 1.3 tokens per whitespace-separated word
+    return max(1, int(len(sentence.split()) * 1.3))
+
+def pack_chunks(sentences, token_budget=DEFAULT_TOKEN_BUDGET):
+    chunks = []
+    chunk = []
+    chunk_tokens = 0
+    for sentence in sentences:
+        tokens = estimate_tokens(sentence)
+        if chunk and chunk_tokens + tokens > token_budget:
+            chunks.append(chunk)
+            chunk = []
+            chunk_tokens = 0
+        chunk.append(sentence)
+        chunk_tokens += tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def _init_worker(src_lang, tgt_lang, workers):
+    global _worker_translation
+    # Split the cores between workers instead of letting each one grab all of them
+    configure_translation(workers)
+    _worker_translation = get_translation(src_lang, tgt_lang)
+    if _worker_translation is None:
+        logging.error(f"Worker {os.getpid()} could not load translation '{src_lang}' -> '{tgt_lang}'.")
+
+def _translate_chunk(chunk):
+    with metrics.timer('translation_chunk'):
+        return translate_batch(_worker_translation, chunk)
+
+def get_pool(src_lang, tgt_lang, workers):
+    key = (src_lang, tgt_lang, workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                # spawn: forking a process that already holds torch/CUDA state is unsafe
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(src_lang, tgt_lang, workers),
+            )
+            _pools[key] = pool
+    return pool
+
+def shutdown_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+atexit.register(shutdown_pools)
+
+def count_paragraphs(input_text):
+    # Paragraphs the translation of input_text will have: one per line
+    return len(split_paragraphs(input_text))
+
+def iter_translated_chunks(chunks, src_lang, tgt_lang, translation, workers=None):
+    # Yields {sentence: translation} per chunk, in chunk order
+    workers = DEFAULT_WORKERS if workers is None else workers
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            with metrics.timer('translation_chunk'):
+                results = dict(zip(chunk, translate_batch(translation, chunk)))
+            yield results
+        return
+
+    pool = get_pool(src_lang, tgt_lang, workers)
+    # Keep a bounded window of chunks in flight so a cancelled stream stops quickly
+    window = workers * 2
+    pending = deque()
+    next_chunk = 0
+    try:
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < window:
+                chunk = chunks[next_chunk]
+                pending.append((chunk, pool.submit(_translate_chunk, chunk)))
+                next_chunk += 1
+            chunk, future = pending.popleft()
+            yield dict(zip(chunk, future.result()))
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+def iter_translate_document(input_text, src_lang, tgt_lang, translation, workers=None, token_budget=DEFAULT_TOKEN_BUDGET):
+    # Yields translated paragraphs (one per input line) in document order as
+    # soon as all their sentences are done
+    return iter_translate_paragraphs(split_paragraphs(input_text), src_lang, tgt_lang, translation, workers, token_budget)
+
+def iter_translate_paragraphs(paragraph_texts, src_lang, tgt_lang, translation, workers=None, token_budget=DEFAULT_TOKEN_BUDGET):
+    paragraphs = split_document(paragraph_texts, src_lang)
+    unique_sentences = list(dict.fromkeys(s for sentences in paragraphs for s in sentences))
+
+    memory = get_translation_memory()
+    version = model_version(translation, src_lang, tgt_lang)
+    known = memory.get_many(unique_sentences, src_lang, tgt_lang, version)
+    logging.debug(f"Translation memory served {len(known)} of {len(unique_sentences)} sentences.")
+
+    missing = [s for s in unique_sentences if s not in known]
+    chunks = pack_chunks(missing, token_budget)
+    metrics.count('characters', sum(len(s) for s in missing), stage='translation')
+    metrics.count('sentences', len(missing), stage='translation')
+
+    next_paragraph = 0
+    for results in chain([{}], iter_translated_chunks(chunks, src_lang, tgt_lang, translation, workers)):
+        memory.put_many(results, src_lang, tgt_lang, version)
+        known.update(results)
+        while next_paragraph < len(paragraphs) and all(s in known for s in paragraphs[next_paragraph]):
+            yield ' '.join(known[s] for s in paragraphs[next_paragraph])
+            next_paragraph += 1
+
+def translate_document(input_text, src_lang, tgt_lang, translation, workers=None, token_budget=DEFAULT_TOKEN_BUDGET):
+    return '\n'.join(iter_translate_document(input_text, src_lang, tgt_lang, translation, workers, token_budget))
+
+def translate_documents(texts, src_lang, tgt_lang, translation, workers=None, token_budget=DEFAULT_TOKEN_BUDGET, progress=None):
+    # Several documents in one pass: one translation memory lookup, sentences
+    # shared between documents translated once, one set of chunks for the pool.
+    # progress(done, total) is called after each translated paragraph.
+    per_document = [split_paragraphs(text) for text in texts]
+    total = sum(len(paragraph_texts) for paragraph_texts in per_document)
+    all_paragraphs = [paragraph for paragraph_texts in per_document for paragraph in paragraph_texts]
+    paragraphs = []
+    for paragraph in iter_translate_paragraphs(all_paragraphs, src_lang, tgt_lang, translation, workers, token_budget):
+        paragraphs.append(paragraph)
+        if progress is not None:
+            progress(len(paragraphs), total)
+    results = []
+    start = 0
+    for paragraph_texts in per_document:
+        end = start + len(paragraph_texts)
+        results.append('\n'.join(paragraphs[start:end]))
+        start = end
+    return results
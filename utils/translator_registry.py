@@ -0,0 +1,119 @@
+# utils/translator_registry.py
+
+import logging
+from functools import lru_cache
+import threading
+import time
+from .runtime_config import configure_translation
+
+# (src_lang, tgt_lang) -> Argos translation object, resolved once per process
+_translations = {}
+_translations_lock = threading.Lock()
+
+def load_translation(src_lang, tgt_lang):
+    # Device, threads, compute type and beam size must be set before Argos is imported
+    configure_translation()
+    import argostranslate.translate
+    installed_languages = argostranslate.translate.get_installed_languages()
+    from_lang = next((lang for lang in installed_languages if lang.code == src_lang), None)
+    to_lang = next((lang for lang in installed_languages if lang.code == tgt_lang), None)
+    if from_lang is None or to_lang is None:
+        return None
+    return from_lang.get_translation(to_lang)
+
+def get_translation(src_lang, tgt_lang):
+    key = (src_lang, tgt_lang)
+    translation = _translations.get(key)
+    if translation is None:
+        with _translations_lock:
+            translation = _translations.get(key)
+            if translation is None:
+                start = time.perf_counter()
+                translation = load_translation(src_lang, tgt_lang)
+                if translation is None:
+                    # Not cached, so a package installed later is picked up without a restart
+                    logging.error(f"No installed Argos package for '{src_lang}' -> '{tgt_lang}'.")
+                    return None
+                _translations[key] = translation
+                logging.info(
+                    f"Loaded Argos translation '{src_lang}' -> '{tgt_lang}' in {time.perf_counter() - start:.2f}s."
+                )
+    return translation
+
+def _package_translation(translation):
+    # The Argos PackageTranslation behind a (possibly cached) translation, or
+    # None for anything else (pivot translations, stand-ins in benchmarks)
+    translation = getattr(translation, 'underlying', translation)
+    if getattr(translation, 'pkg', None) is None or not hasattr(translation, 'translator'):
+        return None
+    return translation
+
+def package_version(translation):
+    # Version of the Argos package behind a loaded translation, as
+    # installed_package_version() reports it; None when there is no package
+    package_translation = _package_translation(translation)
+    if package_translation is None:
+        return None
+    return package_translation.pkg.package_version
+
+def _ctranslate2_translator(translation):
+    # Created the same way PackageTranslation.hypotheses() does on first use
+    if translation.translator is None:
+        import ctranslate2
+        from argostranslate import settings
+        translation.translator = ctranslate2.Translator(
+            str(translation.pkg.package_path / 'model'),
+            device=settings.device,
+            inter_threads=settings.inter_threads,
+            intra_threads=settings.intra_threads,
+            compute_type=settings.compute_type,
+        )
+    return translation.translator
+
+def translate_batch(translation, sentences):
+    # One translation per sentence, with all sentences going to CTranslate2 in
+    # a single translate_batch call. translation.translate() would run Argos'
+    # sentencizer and a separate batch per call. Mirrors Argos'
+    # apply_packaged_translation() with one hypothesis.
+    package_translation = _package_translation(translation)
+    if package_translation is None:
+        return [translation.translate(sentence) for sentence in sentences]
+    if not sentences:
+        return []
+    from argostranslate import settings
+    pkg = package_translation.pkg
+    tokenized = [pkg.tokenizer.encode(sentence) for sentence in sentences]
+    target_prefix = [[pkg.target_prefix]] * len(tokenized) if pkg.target_prefix else None
+    results = _ctranslate2_translator(package_translation).translate_batch(
+        tokenized,
+        target_prefix=target_prefix,
+        replace_unknowns=True,
+        max_batch_size=settings.batch_size,
+        batch_type='tokens',
+        beam_size=max(1, settings.beam_size),
+        num_hypotheses=1,
+        length_penalty=0.2,
+    )
+    translated = []
+    for result in results:
+        value = pkg.tokenizer.decode(result.hypotheses[0])
+        if pkg.target_prefix and value.startswith(pkg.target_prefix):
+            value = value[len(pkg.target_prefix):]
+        # The tokenizer adds a leading space
+        translated.append(value[1:] if value.startswith(' ') else value)
+    return translated
+
+@lru_cache(maxsize=None)
+def installed_package_version(src_lang, tgt_lang):
+    # Package metadata only; unlike get_translation this does not load the model
+    configure_translation()
+    import argostranslate.package
+    pkg = next(
+        (p for p in argostranslate.package.get_installed_packages() if p.from_code == src_lang and p.to_code == tgt_lang),
+        None
+    )
+    return getattr(pkg, 'package_version', None)
+
+def clear_translations():
+    with _translations_lock:
+        _translations.clear()